@@ -6,29 +6,240 @@ This script demonstrates how Shihan could push supervision metrics to Graphite
 for long-term health tracking (a future extension mentioned in shihan_creation.txt).
 """
 
+import math
 import time
-import socket
 import random
+import queue
+import asyncio
+import pickle
+import socket
+import struct
 import argparse
-from datetime import datetime, timedelta
+import threading
+
+# Default receiver port for each supported protocol
+DEFAULT_PORTS = {
+    "tcp": 2003,
+    "udp": 2003,
+    "pickle": 2004,
+}
+
+# Keep each plaintext frame under one TCP segment
+MAX_BATCH_BYTES = 8192
+
+# Keep each UDP datagram under a typical path MTU to avoid fragmentation
+MAX_DATAGRAM_BYTES = 1400
+
+# Maximum number of metrics coalesced into a single write
+MAX_BATCH_METRICS = 200
+
+# Maximum number of metrics waiting for the sender thread
+QUEUE_SIZE = 256
+
+# Sentinel that tells the sender thread to stop
+_STOP = object()
+
+def _encode_line(prefix, name, value, timestamp):
+    """
+    Encode one metric in Graphite's plaintext protocol.
+    
+    Args:
+        prefix: Encoded metric prefix, including the trailing dot.
+        name: Metric name.
+        value: Metric value.
+        timestamp: Timestamp for the metric.
+        
+    Returns:
+        The encoded metric line.
+    """
+    return b"%b%b %b %d\n" % (prefix, name.encode('utf-8'), str(value).encode('ascii'), timestamp)
 
 class GraphiteClient:
     """
     Simple client for sending metrics to Graphite.
+    
+    Metrics are queued and written by a background thread so a slow Graphite
+    server never stalls the caller. Metrics that arrive while the queue is
+    full are dropped and counted in `dropped`.
+    
+    Supported protocols:
+        tcp: Plaintext lines over a persistent TCP connection.
+        udp: Plaintext lines in connectionless datagrams.
+        pickle: Length-prefixed pickled batches over TCP (port 2004).
     """
     
-    def __init__(self, host='localhost', port=2003, prefix='shihan'):
+    def __init__(self, host='localhost', port=None, prefix='shihan', protocol='tcp'):
         """
         Initialize the Graphite client.
         
         Args:
             host: Graphite server host.
-            port: Graphite server port.
+            port: Graphite server port (default: the protocol's standard port).
             prefix: Prefix for all metrics.
+            protocol: Wire protocol to use (tcp, udp, or pickle).
         """
+        if protocol not in DEFAULT_PORTS:
+            raise ValueError(f"Unsupported Graphite protocol: {protocol}")
+        
         self.host = host
-        self.port = port
+        self.port = port or DEFAULT_PORTS[protocol]
         self.prefix = prefix
+        
+        # The prefix never changes, so render it once
+        self._prefix_path = f"{prefix}."
+        self._prefix_bytes = self._prefix_path.encode('ascii')
+        self.protocol = protocol
+        self._sock = None
+        self.dropped = 0
+        
+        # Start the background sender
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._sender = threading.Thread(target=self._sender_loop, daemon=True)
+        self._sender.start()
+    
+    def _connect(self):
+        """
+        Open the long-lived socket to Graphite.
+        
+        Returns:
+            The socket, connected for TCP-based protocols.
+        """
+        if self.protocol == "udp":
+            return socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        sock = socket.create_connection((self.host, self.port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return sock
+    
+    def _disconnect(self):
+        """
+        Close the connection to Graphite, if one is open.
+        """
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+    
+    def close(self):
+        """
+        Flush queued metrics, stop the sender thread, and close the connection.
+        """
+        if self._sender.is_alive():
+            self._queue.put(_STOP)
+            self._sender.join()
+        self._disconnect()
+    
+    def _sender_loop(self):
+        """
+        Drain the queue, coalescing pending metrics into a single write.
+        """
+        while True:
+            metric = self._queue.get()
+            if metric is _STOP:
+                break
+            
+            batch = [metric]
+            stopping = False
+            
+            # Coalesce whatever else is already waiting
+            while len(batch) < MAX_BATCH_METRICS:
+                try:
+                    metric = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if metric is _STOP:
+                    stopping = True
+                    break
+                batch.append(metric)
+            
+            self._flush(batch)
+            
+            if stopping:
+                break
+    
+    def _enqueue(self, metric):
+        """
+        Hand a metric to the sender thread without blocking.
+        
+        Args:
+            metric: A (name, value, timestamp) tuple.
+            
+        Returns:
+            True if the metric was queued, False if it was dropped.
+        """
+        try:
+            self._queue.put_nowait(metric)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+    
+    def _flush(self, batch):
+        """
+        Encode a batch of metrics for the configured protocol and send it.
+        
+        Args:
+            batch: List of (name, value, timestamp) tuples.
+        """
+        if self.protocol == "pickle":
+            # One length-prefixed frame carries the whole batch
+            payload = pickle.dumps(
+                [(self._prefix_path + name, (timestamp, value)) for name, value, timestamp in batch],
+                protocol=2
+            )
+            self._send(struct.pack("!L", len(payload)) + payload)
+            return
+        
+        limit = MAX_DATAGRAM_BYTES if self.protocol == "udp" else MAX_BATCH_BYTES
+        frame = []
+        frame_size = 0
+        
+        prefix = self._prefix_bytes
+        
+        for name, value, timestamp in batch:
+            line = _encode_line(prefix, name, value, timestamp)
+            
+            # Flush before the frame grows past the size limit
+            if frame and frame_size + len(line) > limit:
+                self._send(b"".join(frame))
+                frame = []
+                frame_size = 0
+            
+            frame.append(line)
+            frame_size += len(line)
+        
+        if frame:
+            self._send(b"".join(frame))
+    
+    def _send(self, payload):
+        """
+        Write an encoded payload to Graphite.
+        
+        Args:
+            payload: Encoded metric lines or a pickle frame.
+            
+        Returns:
+            True if the payload was sent, False otherwise.
+        """
+        try:
+            # Reuse the open socket, reconnecting if the last send dropped it
+            if not self._sock:
+                self._sock = self._connect()
+            
+            if self.protocol == "udp":
+                self._sock.sendto(payload, (self.host, self.port))
+            else:
+                self._sock.sendall(payload)
+            return True
+            
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            # Drop the broken connection so the next call reconnects
+            self._disconnect()
+            print(f"Error sending metric to Graphite: {str(e)}")
+            return False
+        except Exception as e:
+            print(f"Error sending metric to Graphite: {str(e)}")
+            return False
     
     def send_metric(self, name, value, timestamp=None):
         """
@@ -40,90 +251,276 @@ class GraphiteClient:
             timestamp: Timestamp for the metric (default: current time).
         """
         if timestamp is None:
-            timestamp = int(time.time())
+            timestamp = time.time_ns() // 1_000_000_000
+        
+        if not self._enqueue((name, value, timestamp)):
+            return False
         
-        # Format the metric
-        metric = f"{self.prefix}.{name} {value} {timestamp}\n"
+        print(f"Queued metric: {self._prefix_path}{name} {value} {timestamp}")
+        return True
+    
+    def send_batch(self, metrics):
+        """
+        Queue several metrics for Graphite at once.
+        
+        The sender thread coalesces queued metrics, so a batch goes out in as
+        few writes as possible.
+        
+        Args:
+            metrics: List of (name, value, timestamp) tuples. A timestamp of
+                None means the current time, read once for the whole batch.
+        """
+        now = time.time_ns() // 1_000_000_000
+        
+        queued = 0
+        for name, value, timestamp in metrics:
+            if self._enqueue((name, value, now if timestamp is None else timestamp)):
+                queued += 1
+        
+        print(f"Queued {queued} of {len(metrics)} metrics")
+        return queued == len(metrics)
+
+class AsyncGraphiteClient:
+    """
+    Asyncio client for sending plaintext metrics to Graphite over TCP.
+    
+    Lines are written with StreamWriter.writelines, so a whole batch leaves in
+    as few syscalls as the event loop allows, and drain() is only awaited
+    once per batch rather than once per line.
+    """
+    
+    def __init__(self, host='localhost', port=DEFAULT_PORTS["tcp"], prefix='shihan'):
+        """
+        Initialize the async Graphite client.
+        
+        Args:
+            host: Graphite server host.
+            port: Graphite server port.
+            prefix: Prefix for all metrics.
+        """
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self._prefix_bytes = f"{prefix}.".encode('ascii')
+        self._writer = None
+    
+    async def _connect(self):
+        """
+        Open the long-lived connection to Graphite.
+        
+        Returns:
+            The connected StreamWriter.
+        """
+        _, writer = await asyncio.open_connection(self.host, self.port)
+        sock = writer.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return writer
+    
+    async def close(self):
+        """
+        Close the connection to Graphite, if one is open.
+        """
+        if self._writer:
+            writer = self._writer
+            self._writer = None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+    
+    async def send_batch(self, metrics):
+        """
+        Send several metrics to Graphite, draining once per full frame.
+        
+        Args:
+            metrics: List of (name, value, timestamp) tuples. A timestamp of
+                None means the current time, read once for the whole batch.
+        """
+        now = time.time_ns() // 1_000_000_000
+        prefix = self._prefix_bytes
         
         try:
-            # Send the metric to Graphite
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect((self.host, self.port))
-            sock.send(metric.encode('utf-8'))
-            sock.close()
+            # Reuse the open connection, reconnecting if the last send dropped it
+            if not self._writer:
+                self._writer = await self._connect()
             
-            print(f"Sent metric: {metric.strip()}")
+            frame = []
+            frame_size = 0
+            for name, value, timestamp in metrics:
+                line = _encode_line(prefix, name, value, now if timestamp is None else timestamp)
+                frame.append(line)
+                frame_size += len(line)
+                
+                # Apply backpressure once per frame, not once per line
+                if frame_size >= MAX_BATCH_BYTES:
+                    self._writer.writelines(frame)
+                    await self._writer.drain()
+                    frame = []
+                    frame_size = 0
+            
+            if frame:
+                self._writer.writelines(frame)
+                await self._writer.drain()
+            
+            print(f"Sent {len(metrics)} metrics")
             return True
             
-        except Exception as e:
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            # Drop the broken connection so the next call reconnects
+            await self.close()
             print(f"Error sending metric to Graphite: {str(e)}")
             return False
+    
+    async def send_metric(self, name, value, timestamp=None):
+        """
+        Send a metric to Graphite.
+        
+        Args:
+            name: Metric name.
+            value: Metric value.
+            timestamp: Timestamp for the metric (default: current time).
+        """
+        return await self.send_batch([(name, value, timestamp)])
 
-def simulate_metrics(client, duration_minutes=10, interval_seconds=10):
+def _simulated_ticks(duration_minutes, interval_seconds):
     """
-    Simulate sending metrics to Graphite.
+    Generate one batch of simulated metrics per tick until the duration ends.
+    
+    All random draws for the run are made up front, so each tick only
+    indexes precomputed lists. The caller is responsible for pacing between
+    ticks.
     
     Args:
-        client: GraphiteClient instance.
         duration_minutes: Duration to simulate metrics for.
         interval_seconds: Interval between metrics.
+        
+    Yields:
+        A list of (name, value, None) tuples for each tick, to be stamped
+        with the send time.
     """
-    print(f"Simulating metrics for {duration_minutes} minutes with {interval_seconds} second intervals")
+    if interval_seconds <= 0:
+        raise ValueError("interval_seconds must be positive")
     
-    # Calculate end time
-    end_time = datetime.now() + timedelta(minutes=duration_minutes)
+    # Calculate end time on the monotonic clock
+    end_time = time.monotonic() + duration_minutes * 60
+    n_ticks = max(1, math.ceil(duration_minutes * 60 / interval_seconds))
+    
+    # Pre-draw every tick's randomness: event decisions, integer sizes, and
+    # score noise in [-0.1, 0.1), as random.uniform(-0.1, 0.1) draws it
+    ticks = range(n_ticks)
+    rand = random.random
+    decisions = [(rand(), rand(), rand()) for _ in ticks]
+    cycle_durations = random.choices(range(60, 301), k=n_ticks)
+    cycle_changes = random.choices(range(0, 6), k=n_ticks)
+    severities = random.choices(range(1, 4), k=n_ticks)
+    noise = [(rand() * 0.2 - 0.1, rand() * 0.2 - 0.1, rand() * 0.2 - 0.1) for _ in ticks]
     
     # Counters for various events
     cycle_count = 0
     error_count = 0
     violation_count = 0
     
-    # Simulate metrics
-    while datetime.now() < end_time:
-        # Current timestamp
-        now = int(time.time())
+    for i in range(n_ticks):
+        if time.monotonic() >= end_time:
+            break
+        
+        cycle_roll, error_roll, violation_roll = decisions[i]
+        qed_noise, sa_noise, loss_noise = noise[i]
+        
+        # Metrics to flush at the end of this tick; the client stamps the
+        # whole batch with one clock read
+        batch = []
         
         # Simulate cycle completion
-        if random.random() < 0.2:  # 20% chance of cycle completion
+        if cycle_roll < 0.2:  # 20% chance of cycle completion
             cycle_count += 1
+            batch.append(("cycles.count", cycle_count, None))
             
             # Cycle duration (in seconds)
-            cycle_duration = random.randint(60, 300)
-            client.send_metric("cycles.count", cycle_count, now)
-            client.send_metric("cycles.duration", cycle_duration, now)
+            batch.append(("cycles.duration", cycle_durations[i], None))
             
             # Changes made in this cycle
-            changes = random.randint(0, 5)
-            client.send_metric("cycles.changes", changes, now)
+            batch.append(("cycles.changes", cycle_changes[i], None))
         
         # Simulate log errors
-        if random.random() < 0.1:  # 10% chance of log error
+        if error_roll < 0.1:  # 10% chance of log error
             error_count += 1
-            client.send_metric("errors.count", error_count, now)
+            batch.append(("errors.count", error_count, None))
             
             # Error severity (1-3)
-            severity = random.randint(1, 3)
-            client.send_metric("errors.severity", severity, now)
+            batch.append(("errors.severity", severities[i], None))
         
         # Simulate creed violations
-        if random.random() < 0.05:  # 5% chance of creed violation
+        if violation_roll < 0.05:  # 5% chance of creed violation
             violation_count += 1
-            client.send_metric("violations.count", violation_count, now)
+            batch.append(("violations.count", violation_count, None))
         
         # Simulate QED score
-        qed_score = 0.65 + random.uniform(-0.1, 0.1)
-        client.send_metric("metrics.qed_score", round(qed_score, 4), now)
+        batch.append(("metrics.qed_score", round(0.65 + qed_noise, 4), None))
         
         # Simulate SA score
-        sa_score = 0.72 + random.uniform(-0.1, 0.1)
-        client.send_metric("metrics.sa_score", round(sa_score, 4), now)
+        batch.append(("metrics.sa_score", round(0.72 + sa_noise, 4), None))
         
         # Simulate loss
-        loss = 0.3 + random.uniform(-0.1, 0.1)
-        client.send_metric("metrics.loss", round(loss, 4), now)
+        batch.append(("metrics.loss", round(0.3 + loss_noise, 4), None))
         
-        # Wait for the next interval
-        time.sleep(interval_seconds)
+        yield batch
+
+def simulate_metrics(client, duration_minutes=10, interval_seconds=10):
+    """
+    Simulate sending metrics to Graphite.
+    
+    Args:
+        client: GraphiteClient instance.
+        duration_minutes: Duration to simulate metrics for.
+        interval_seconds: Interval between metrics.
+    """
+    print(f"Simulating metrics for {duration_minutes} minutes with {interval_seconds} second intervals")
+    
+    # Simulate metrics
+    try:
+        next_tick = time.monotonic()
+        for batch in _simulated_ticks(duration_minutes, interval_seconds):
+            # Flush this tick's metrics in a single frame
+            client.send_batch(batch)
+            
+            # Wait for the next tick deadline so send time doesn't add drift
+            next_tick += interval_seconds
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+    finally:
+        client.close()
+        if client.dropped:
+            print(f"Dropped {client.dropped} metrics while the queue was full")
+
+async def simulate_metrics_async(client, duration_minutes=10, interval_seconds=10):
+    """
+    Simulate sending metrics to Graphite from an asyncio event loop.
+    
+    Args:
+        client: AsyncGraphiteClient instance.
+        duration_minutes: Duration to simulate metrics for.
+        interval_seconds: Interval between metrics.
+    """
+    print(f"Simulating metrics for {duration_minutes} minutes with {interval_seconds} second intervals (async)")
+    
+    # Simulate metrics
+    try:
+        next_tick = time.monotonic()
+        for batch in _simulated_ticks(duration_minutes, interval_seconds):
+            # Flush this tick's metrics in a single frame
+            await client.send_batch(batch)
+            
+            # Wait for the next tick deadline so send time doesn't add drift
+            next_tick += interval_seconds
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+    finally:
+        await client.close()
 
 def main():
     """
@@ -131,20 +528,27 @@ def main():
     """
     parser = argparse.ArgumentParser(description="Shihan MCP Graphite Integration Example")
     parser.add_argument("--host", default="localhost", help="Graphite server host")
-    parser.add_argument("--port", type=int, default=2003, help="Graphite server port")
+    parser.add_argument("--port", type=int, default=None, help="Graphite server port (default: 2003, or 2004 for pickle)")
+    parser.add_argument("--protocol", choices=sorted(DEFAULT_PORTS), default="tcp", help="Graphite wire protocol")
     parser.add_argument("--prefix", default="shihan", help="Metric prefix")
     parser.add_argument("--duration", type=int, default=10, help="Duration in minutes")
     parser.add_argument("--interval", type=int, default=10, help="Interval in seconds")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Send from an asyncio event loop (tcp only)")
     args = parser.parse_args()
     
-    print("📊 Shihan MCP Graphite Integration Example")
+    if args.use_async and args.protocol != "tcp":
+        parser.error("--async only supports the tcp protocol")
     
-    # Create Graphite client
-    client = GraphiteClient(host=args.host, port=args.port, prefix=args.prefix)
+    print("📊 Shihan MCP Graphite Integration Example")
     
     # Simulate metrics
     try:
-        simulate_metrics(client, args.duration, args.interval)
+        if args.use_async:
+            client = AsyncGraphiteClient(host=args.host, port=args.port or DEFAULT_PORTS["tcp"], prefix=args.prefix)
+            asyncio.run(simulate_metrics_async(client, args.duration, args.interval))
+        else:
+            client = GraphiteClient(host=args.host, port=args.port, prefix=args.prefix, protocol=args.protocol)
+            simulate_metrics(client, args.duration, args.interval)
     except KeyboardInterrupt:
         print("\nSimulation stopped by user")
     
@@ -6,42 +6,82 @@ This script demonstrates how to call Shihan's tools directly from Python code.
 """
 
 import asyncio
-import json
 import sys
+from contextlib import AsyncExitStack
 from mcp.client.stdio import stdio_client
 from mcp import ClientSession, StdioServerParameters
 
-async def call_shihan_tool(tool_name, args):
+from tool_results import parse_tool_result
+
+class ShihanSession:
     """
-    Call a Shihan MCP tool.
+    A single Shihan MCP session shared across tool calls.
     
-    Args:
-        tool_name: The name of the tool to call.
-        args: The arguments to pass to the tool.
-        
-    Returns:
-        The result of the tool call.
+    The server process is spawned and the session initialized once on entry,
+    so each tool call only pays for its own request.
     """
-    # Set up server parameters
-    params = StdioServerParameters(
-        command='shihan-mcp',
-        args=[],
-    )
     
-    # Connect to the server
-    async with stdio_client(params) as (r, w):
-        async with ClientSession(r, w) as s:
-            # Initialize the session
-            await s.initialize()
+    def __init__(self, command='shihan-mcp', args=None):
+        """
+        Initialize the session parameters.
+        
+        Args:
+            command: The command that starts the Shihan MCP server.
+            args: Arguments to pass to the server command.
+        """
+        self.params = StdioServerParameters(
+            command=command,
+            args=args or [],
+        )
+        self._stack = None
+        self.s = None
+    
+    async def __aenter__(self):
+        """
+        Start the server and initialize the session.
+        
+        Returns:
+            The ShihanSession itself.
+        """
+        self._stack = AsyncExitStack()
+        try:
+            # Connect to the server
+            r, w = await self._stack.enter_async_context(stdio_client(self.params))
+            self.s = await self._stack.enter_async_context(ClientSession(r, w))
             
-            # Call the tool
-            resp = await s.call_tool(
-                name=tool_name,
-                arguments={"args": args},
-            )
+            # Initialize the session
+            await self.s.initialize()
+        except BaseException:
+            await self._stack.aclose()
+            raise
+        
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+        Close the session and stop the server.
+        """
+        await self._stack.aclose()
+        self.s = None
+    
+    async def call(self, tool_name, args):
+        """
+        Call a Shihan MCP tool.
+        
+        Args:
+            tool_name: The name of the tool to call.
+            args: The arguments to pass to the tool.
             
-            # Parse and return the result
-            return json.loads(resp.content[0].text)
+        Returns:
+            The result of the tool call.
+        """
+        resp = await self.s.call_tool(
+            name=tool_name,
+            arguments={"args": args},
+        )
+        
+        # Parse and return the result
+        return parse_tool_result(resp)
 
 async def main():
     """
@@ -49,34 +89,50 @@ async def main():
     """
     print("🥋 Hayato's Shihan MCP Integration Example")
     
+    # One server process and session for every example below
+    results = ()
+    try:
+        async with ShihanSession() as sess:
+            # The examples are independent, so issue them concurrently; MCP
+            # matches each response to its request id
+            # (You can replace the audited file with any Python file you want to audit)
+            results = await asyncio.gather(
+                sess.call("tail_log", {"tail_lines": 100}),
+                sess.call("audit_creed", {"files": ["shihan_mcp/server.py"]}),
+                sess.call("supervise_cycle", {"event": "manual_check"}),
+                return_exceptions=True,
+            )
+    except Exception as e:
+        # The server could not be started (e.g. shihan-mcp is not installed)
+        # or the session failed, so each example reports the error
+        results = results or (e, e, e)
+    log_result, audit_result, cycle_result = results
+    
     # Example 1: Tail the log
     print("\n📋 Example 1: Tailing the log")
-    try:
-        log_result = await call_shihan_tool("tail_log", {"tail_lines": 100})
+    if isinstance(log_result, Exception):
+        print(f"Error tailing log: {str(log_result)}")
+    else:
         print(f"Log Summary: {log_result.get('summary')}")
         if log_result.get('last_error'):
             print(f"Last Error: {log_result.get('last_error')}")
-    except Exception as e:
-        print(f"Error tailing log: {str(e)}")
     
     # Example 2: Audit a Python file
     print("\n🔍 Example 2: Auditing a Python file")
-    try:
-        # You can replace this with any Python file you want to audit
-        audit_result = await call_shihan_tool("audit_creed", {"files": ["shihan_mcp/server.py"]})
-        if audit_result.get('violations'):
-            print("Violations found:")
-            for violation in audit_result.get('violations'):
-                print(f"  - {violation}")
-        else:
-            print("No violations found")
-    except Exception as e:
-        print(f"Error auditing file: {str(e)}")
+    if isinstance(audit_result, Exception):
+        print(f"Error auditing file: {str(audit_result)}")
+    elif audit_result.get('violations'):
+        print("Violations found:")
+        for violation in audit_result.get('violations'):
+            print(f"  - {violation}")
+    else:
+        print("No violations found")
     
     # Example 3: Supervise a cycle
     print("\n🔄 Example 3: Supervising a cycle")
-    try:
-        cycle_result = await call_shihan_tool("supervise_cycle", {"event": "manual_check"})
+    if isinstance(cycle_result, Exception):
+        print(f"Error supervising cycle: {str(cycle_result)}")
+    else:
         print(f"Status: {cycle_result.get('status')}")
         print("Actions taken:")
         for action in cycle_result.get('actions_taken', []):
@@ -85,8 +141,6 @@ async def main():
             print("Issues found:")
             for issue in cycle_result.get('issues_found'):
                 print(f"  - {issue}")
-    except Exception as e:
-        print(f"Error supervising cycle: {str(e)}")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -8,10 +8,29 @@ and alarm on regression (a future extension mentioned in shihan_creation.txt).
 
 import os
 import json
-import random
-import matplotlib.pyplot as plt
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from datetime import datetime, timedelta
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Metrics checked for drift
+DRIFT_METRICS = ("qed_score", "sa_score", "loss")
+
+# Sign that turns (prev - current) into a regression: lower QED/SA is worse,
+# higher loss is worse
+DRIFT_DIRECTION = np.array([1.0, 1.0, -1.0])
+
 # Simulate training metrics over time
 def generate_sample_metrics(num_epochs=50):
     """
@@ -23,7 +42,8 @@ def generate_sample_metrics(num_epochs=50):
     Returns:
         A dictionary of metrics by epoch.
     """
-    metrics = {}
+    rng = np.random.default_rng()
+    epochs = np.arange(1, num_epochs + 1)
     
     # Start date (10 days ago)
     start_date = datetime.now() - timedelta(days=10)
@@ -33,38 +53,107 @@ def generate_sample_metrics(num_epochs=50):
     sa_base = 0.72
     loss_base = 0.5
     
-    for epoch in range(1, num_epochs + 1):
-        # Calculate date for this epoch
-        epoch_date = start_date + timedelta(hours=epoch * 4)
-        date_str = epoch_date.strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Generate metrics with some randomness and trends
-        if epoch < 30:
-            # Improving trend
-            qed = qed_base + (epoch * 0.005) + random.uniform(-0.02, 0.02)
-            sa = sa_base + (epoch * 0.004) + random.uniform(-0.02, 0.02)
-            loss = loss_base - (epoch * 0.01) + random.uniform(-0.02, 0.02)
-        else:
-            # Regression after epoch 30
-            qed = qed_base + (30 * 0.005) - ((epoch - 30) * 0.01) + random.uniform(-0.02, 0.02)
-            sa = sa_base + (30 * 0.004) - ((epoch - 30) * 0.008) + random.uniform(-0.02, 0.02)
-            loss = loss_base - (30 * 0.01) + ((epoch - 30) * 0.02) + random.uniform(-0.02, 0.02)
-        
-        # Ensure values are in reasonable range
-        qed = max(0.0, min(1.0, qed))
-        sa = max(0.0, min(1.0, sa))
-        loss = max(0.0, loss)
-        
-        # Store metrics
+    # One row of noise per metric, drawn in a single call
+    noise = rng.uniform(-0.02, 0.02, (3, num_epochs))
+    
+    # Generate metrics with some randomness and trends:
+    # improving until epoch 30, then regressing
+    improving = epochs < 30
+    past_peak = epochs - 30
+    qed = np.where(improving, qed_base + epochs * 0.005, qed_base + 30 * 0.005 - past_peak * 0.01) + noise[0]
+    sa = np.where(improving, sa_base + epochs * 0.004, sa_base + 30 * 0.004 - past_peak * 0.008) + noise[1]
+    loss = np.where(improving, loss_base - epochs * 0.01, loss_base - 30 * 0.01 + past_peak * 0.02) + noise[2]
+    
+    # Ensure values are in reasonable range
+    qed = np.round(np.clip(qed, 0.0, 1.0), 4).tolist()
+    sa = np.round(np.clip(sa, 0.0, 1.0), 4).tolist()
+    loss = np.round(np.maximum(loss, 0.0), 4).tolist()
+    
+    # Calculate the date for every epoch in one pass
+    dates = [
+        (start_date + timedelta(hours=epoch * 4)).isoformat(sep=' ', timespec='seconds')
+        for epoch in range(1, num_epochs + 1)
+    ]
+    
+    # Store metrics
+    metrics = {}
+    for i, epoch in enumerate(epochs.tolist()):
         metrics[epoch] = {
-            "date": date_str,
-            "qed_score": round(qed, 4),
-            "sa_score": round(sa, 4),
-            "loss": round(loss, 4)
+            "date": dates[i],
+            "qed_score": qed[i],
+            "sa_score": sa[i],
+            "loss": loss[i]
         }
     
     return metrics
 
+def _sliding_median_1d(values, window_size):
+    """
+    Compute rolling medians by sliding a sorted window over the series.
+    
+    Each step removes the value leaving the window and inserts the value
+    entering it, so the window is never re-sorted. Compiled with Numba when
+    it is installed.
+    
+    Args:
+        values: 1-D array of metric values.
+        window_size: Size of the window to compute median over.
+        
+    Returns:
+        An array where element k is the median of values[k:k + window_size].
+    """
+    mid = window_size // 2
+    n_medians = values.shape[0] - window_size + 1
+    medians = np.empty(n_medians)
+    
+    window = np.sort(values[:window_size])
+    medians[0] = window[mid]
+    
+    for k in range(1, n_medians):
+        leaving = values[k - 1]
+        entering = values[k + window_size - 1]
+        
+        # Drop the leaving value by shifting its right neighbours left
+        pos = np.searchsorted(window, leaving)
+        for j in range(pos, window_size - 1):
+            window[j] = window[j + 1]
+        
+        # Insert the entering value by shifting larger values right
+        j = window_size - 1
+        while j > 0 and window[j - 1] > entering:
+            window[j] = window[j - 1]
+            j -= 1
+        window[j] = entering
+        
+        medians[k] = window[mid]
+    
+    return medians
+
+if numba:
+    _sliding_median_1d = numba.njit(cache=True, fastmath=True)(_sliding_median_1d)
+
+def _rolling_median(values, window_size):
+    """
+    Compute the median of every window of consecutive values.
+    
+    Matches the upper median (sorted(window)[window_size // 2]) for even
+    window sizes. Uses the Numba sliding-window kernel when available and
+    NumPy's vectorized selection otherwise.
+    
+    Args:
+        values: Array of metric values, one series per row.
+        window_size: Size of the window to compute median over.
+        
+    Returns:
+        An array where element [..., k] is the median of values[..., k:k + window_size].
+    """
+    if numba:
+        return np.stack([_sliding_median_1d(row, window_size) for row in values])
+    
+    windows = sliding_window_view(values, window_size, axis=-1)
+    mid = window_size // 2
+    return np.partition(windows, mid, axis=-1)[..., mid]
+
 def detect_metric_drift(metrics, window_size=5, threshold=0.05):
     """
     Detect metric drift in the training metrics.
@@ -85,110 +174,168 @@ def detect_metric_drift(metrics, window_size=5, threshold=0.05):
     if len(epochs) < window_size * 2:
         return drift_events
     
+    # One row per metric, built once so all metrics share a single pass
+    values = np.stack([
+        np.fromiter((metrics[epoch][metric_name] for epoch in epochs), dtype=np.float64, count=len(epochs))
+        for metric_name in DRIFT_METRICS
+    ])
+    
     # Compute moving medians
-    for metric_name in ["qed_score", "sa_score", "loss"]:
-        for i in range(window_size, len(epochs) - window_size + 1):
-            # Current window
-            current_window = [metrics[epochs[j]][metric_name] for j in range(i, i + window_size)]
-            current_median = sorted(current_window)[len(current_window) // 2]
-            
-            # Previous window
-            prev_window = [metrics[epochs[j]][metric_name] for j in range(i - window_size, i)]
-            prev_median = sorted(prev_window)[len(prev_window) // 2]
-            
-            # Check for drift
-            if metric_name in ["qed_score", "sa_score"]:
-                # For these metrics, lower is worse
-                if prev_median - current_median > threshold:
-                    drift_events.append({
-                        "epoch": epochs[i],
-                        "metric": metric_name,
-                        "prev_median": prev_median,
-                        "current_median": current_median,
-                        "drift": prev_median - current_median,
-                        "date": metrics[epochs[i]]["date"]
-                    })
-            else:
-                # For loss, higher is worse
-                if current_median - prev_median > threshold:
-                    drift_events.append({
-                        "epoch": epochs[i],
-                        "metric": metric_name,
-                        "prev_median": prev_median,
-                        "current_median": current_median,
-                        "drift": current_median - prev_median,
-                        "date": metrics[epochs[i]]["date"]
-                    })
+    medians = _rolling_median(values, window_size)
+    
+    # Window starting at each epoch vs. the window just before it
+    current_medians = medians[:, window_size:]
+    prev_medians = medians[:, :-window_size]
+    
+    # Orient every row so that a positive drift is a regression
+    drift = (prev_medians - current_medians) * DRIFT_DIRECTION[:, np.newaxis]
+    
+    # Check for drift
+    for row, k in zip(*np.nonzero(drift > threshold)):
+        i = k + window_size
+        drift_events.append({
+            "epoch": epochs[i],
+            "metric": DRIFT_METRICS[row],
+            "prev_median": float(prev_medians[row, k]),
+            "current_median": float(current_medians[row, k]),
+            "drift": float(drift[row, k]),
+            "date": metrics[epochs[i]]["date"]
+        })
     
     return drift_events
 
-def plot_metrics(metrics, drift_events=None):
+# Subplot layout: metric key, label, and line style for each panel
+PLOT_PANELS = (
+    ("qed_score", "QED Score", "b-"),
+    ("sa_score", "SA Score", "g-"),
+    ("loss", "Loss", "r-"),
+)
+
+# Output resolution for rendered plots
+PLOT_DPI = 80
+
+# Figure, axes, and artists reused across plot_metrics calls
+_plot_cache = {}
+
+def _get_plot():
     """
-    Plot the metrics and mark drift events.
+    Get the cached drift figure, creating it on first use.
+    
+    The figure is built with the object-oriented Agg API rather than pyplot,
+    so repeated calls only update line data instead of rebuilding artists.
+    
+    Returns:
+        A dictionary with the figure, axes, metric lines, and drift markers.
+    """
+    if not _plot_cache:
+        fig = Figure(figsize=(12, 8))
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(3, 1)
+        
+        lines = []
+        for ax, (metric_name, label, style) in zip(axes, PLOT_PANELS):
+            line, = ax.plot([], [], style, label=label)
+            ax.set_title(f'{label} by Epoch')
+            ax.set_xlabel('Epoch')
+            ax.set_ylabel(label)
+            ax.grid(True)
+            lines.append(line)
+        
+        _plot_cache.update(fig=fig, axes=axes, lines=lines, markers=[])
+    
+    return _plot_cache
+
+def _draw_metrics(metrics, drift_events=None):
+    """
+    Draw the metrics and drift markers onto the cached figure.
     
     Args:
         metrics: Dictionary of metrics by epoch.
         drift_events: List of drift events to mark on the plot.
+        
+    Returns:
+        The drawn Figure.
     """
     epochs = sorted(metrics.keys())
+    plot = _get_plot()
     
-    # Extract metrics
-    dates = [metrics[epoch]["date"] for epoch in epochs]
-    qed_scores = [metrics[epoch]["qed_score"] for epoch in epochs]
-    sa_scores = [metrics[epoch]["sa_score"] for epoch in epochs]
-    losses = [metrics[epoch]["loss"] for epoch in epochs]
+    # Clear drift markers from the previous call
+    for marker in plot["markers"]:
+        marker.remove()
+    plot["markers"].clear()
     
-    # Create figure
-    plt.figure(figsize=(12, 8))
+    for ax, line, (metric_name, label, style) in zip(plot["axes"], plot["lines"], PLOT_PANELS):
+        # Update the metric line in place
+        line.set_data(epochs, [metrics[epoch][metric_name] for epoch in epochs])
+        ax.relim()
+        ax.autoscale_view()
+        
+        # Mark drift events with a single full-height LineCollection per axis
+        drift_epochs = [event["epoch"] for event in drift_events or [] if event["metric"] == metric_name]
+        if drift_epochs:
+            plot["markers"].append(ax.vlines(
+                drift_epochs, 0, 1,
+                transform=ax.get_xaxis_transform(),
+                colors='r', linestyles='--', alpha=0.5
+            ))
     
-    # Plot QED scores
-    plt.subplot(3, 1, 1)
-    plt.plot(epochs, qed_scores, 'b-', label='QED Score')
-    plt.title('QED Score by Epoch')
-    plt.xlabel('Epoch')
-    plt.ylabel('QED Score')
-    plt.grid(True)
+    plot["fig"].tight_layout()
     
-    # Mark drift events
-    if drift_events:
-        for event in drift_events:
-            if event["metric"] == "qed_score":
-                plt.axvline(x=event["epoch"], color='r', linestyle='--', alpha=0.5)
-    
-    # Plot SA scores
-    plt.subplot(3, 1, 2)
-    plt.plot(epochs, sa_scores, 'g-', label='SA Score')
-    plt.title('SA Score by Epoch')
-    plt.xlabel('Epoch')
-    plt.ylabel('SA Score')
-    plt.grid(True)
-    
-    # Mark drift events
-    if drift_events:
-        for event in drift_events:
-            if event["metric"] == "sa_score":
-                plt.axvline(x=event["epoch"], color='r', linestyle='--', alpha=0.5)
-    
-    # Plot losses
-    plt.subplot(3, 1, 3)
-    plt.plot(epochs, losses, 'r-', label='Loss')
-    plt.title('Loss by Epoch')
-    plt.xlabel('Epoch')
-    plt.ylabel('Loss')
-    plt.grid(True)
-    
-    # Mark drift events
-    if drift_events:
-        for event in drift_events:
-            if event["metric"] == "loss":
-                plt.axvline(x=event["epoch"], color='r', linestyle='--', alpha=0.5)
+    return plot["fig"]
+
+def plot_metrics(metrics, drift_events=None):
+    """
+    Plot the metrics and mark drift events.
     
-    plt.tight_layout()
+    Args:
+        metrics: Dictionary of metrics by epoch.
+        drift_events: List of drift events to mark on the plot.
+    """
+    fig = _draw_metrics(metrics, drift_events)
     
-    # Save the plot
-    plt.savefig('metric_drift.png')
+    # Save the plot; PNG encoding dominates savefig, so favour speed over size
+    fig.savefig('metric_drift.png', dpi=PLOT_DPI, pil_kwargs={"compress_level": 1})
     print("Plot saved as metric_drift.png")
 
+def render_metrics_rgba(metrics, drift_events=None):
+    """
+    Render the metrics plot to raw pixels, skipping PNG encoding entirely.
+    
+    Useful when the image is consumed in-process or served as raw pixels.
+    
+    Args:
+        metrics: Dictionary of metrics by epoch.
+        drift_events: List of drift events to mark on the plot.
+        
+    Returns:
+        An (height, width, 4) uint8 RGBA array.
+    """
+    fig = _draw_metrics(metrics, drift_events)
+    fig.set_dpi(PLOT_DPI)
+    fig.canvas.draw()
+    
+    # Copy so the array stays valid after the canvas is redrawn
+    return np.array(fig.canvas.buffer_rgba())
+
+def save_metrics(metrics, path):
+    """
+    Write the metrics to a JSON file.
+    
+    Uses orjson when installed, which encodes straight to bytes instead of
+    going through the stdlib encoder.
+    
+    Args:
+        metrics: Dictionary of metrics by epoch.
+        path: Path of the JSON file to write.
+    """
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    
+    with open(path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
 def main():
     """
     Main function to demonstrate metric drift detection.
@@ -200,8 +347,7 @@ def main():
     metrics = generate_sample_metrics(num_epochs=50)
     
     # Save metrics to file
-    with open('sample_metrics.json', 'w') as f:
-        json.dump(metrics, f, indent=2)
+    save_metrics(metrics, 'sample_metrics.json')
     print("Sample metrics saved to sample_metrics.json")
     
     # Detect metric drift
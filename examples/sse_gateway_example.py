@@ -7,88 +7,145 @@ can subscribe to Shihan events (a future extension mentioned in shihan_creation.
 """
 
 import asyncio
+import ipaddress
 import json
 import subprocess
 import time
 import sys
 import random
+import zlib
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from aiohttp import web
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    from orjson import dumps as json_bytes
+except ImportError:
+    def json_bytes(obj):
+        """Serialize obj to UTF-8 JSON bytes with the stdlib encoder."""
+        return json.dumps(obj, default=datetime.isoformat).encode('utf-8')
+
 # Simulated events that Shihan might emit
-EVENT_TYPES = [
+EVENT_TYPES = (
     "log_error",
     "creed_violation",
     "plan_critique",
     "metric_drift",
     "cycle_complete"
-]
+)
+
+# Number of recent frames kept for clients that fall behind
+FRAME_BUFFER_SIZE = 64
+
+# SSE data framing around each serialized payload
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+
+# Seconds a client may take to accept a write before it is dropped as slow
+SLOW_CLIENT_TIMEOUT = 10.0
+
+# Seconds to collect events before sending them as one SSE message
+BATCH_WINDOW = 0.05
+
+# Sample values the event generators pick from
+SAMPLE_ERRORS = (
+    "RuntimeError: CUDA out of memory",
+    "AssertionError: Tensor dimension mismatch",
+    "ValueError: Expected tensor to have shape (10, 5) but got (10, 10)",
+    "KeyError: 'model_state' not found in checkpoint",
+    "IndexError: Dimension out of range (expected to be in range of [-1, 0], but got 1)"
+)
+SAMPLE_ERROR_SEVERITIES = ("warning", "error", "critical")
+SAMPLE_VIOLATIONS = (
+    "Using 'is None' check (forbidden by Creed)",
+    "Using '**kwargs' (forbidden by Creed)",
+    "Using mock objects (forbidden by Creed)",
+    "Using None fallback pattern (forbidden by Creed)",
+    "Using hasattr() (forbidden by Creed)"
+)
+SAMPLE_FILES = (
+    "model.py",
+    "trainer.py",
+    "data_loader.py",
+    "utils.py",
+    "metrics.py"
+)
+SAMPLE_PLAN_ISSUES = (
+    "Plan lacks specific test cases",
+    "Multiple changes proposed at once",
+    "Solution is overly complex",
+    "Edge cases not considered",
+    "No verification steps included"
+)
+SAMPLE_METRICS = ("qed_score", "sa_score", "loss")
+
+# Number of random picks drawn at a time by buffered_choices
+CHOICE_BATCH_SIZE = 64
 
-# Sample event generators
+def buffered_choices(population):
+    """
+    Pick from population forever, drawing CHOICE_BATCH_SIZE picks per call
+    to random.choices.
+    
+    Args:
+        population: The sequence to pick from.
+        
+    Yields:
+        Random picks from population, one per next() call.
+    """
+    while True:
+        yield from random.choices(population, k=CHOICE_BATCH_SIZE)
+
+_error_picks = buffered_choices(SAMPLE_ERRORS)
+_error_severity_picks = buffered_choices(SAMPLE_ERROR_SEVERITIES)
+_violation_picks = buffered_choices(SAMPLE_VIOLATIONS)
+_file_picks = buffered_choices(SAMPLE_FILES)
+_metric_picks = buffered_choices(SAMPLE_METRICS)
+
+# Sample event generators; timestamps are left as datetimes for the JSON
+# encoder to format
 def generate_log_error_event():
     """Generate a sample log error event."""
-    errors = [
-        "RuntimeError: CUDA out of memory",
-        "AssertionError: Tensor dimension mismatch",
-        "ValueError: Expected tensor to have shape (10, 5) but got (10, 10)",
-        "KeyError: 'model_state' not found in checkpoint",
-        "IndexError: Dimension out of range (expected to be in range of [-1, 0], but got 1)"
-    ]
     return {
         "type": "log_error",
-        "timestamp": datetime.now().isoformat(),
-        "error": random.choice(errors),
+        "timestamp": datetime.now(),
+        "error": next(_error_picks),
         "file": "training.log",
-        "severity": random.choice(["warning", "error", "critical"])
+        "severity": next(_error_severity_picks)
     }
 
 def generate_creed_violation_event():
     """Generate a sample creed violation event."""
-    violations = [
-        "Using 'is None' check (forbidden by Creed)",
-        "Using '**kwargs' (forbidden by Creed)",
-        "Using mock objects (forbidden by Creed)",
-        "Using None fallback pattern (forbidden by Creed)",
-        "Using hasattr() (forbidden by Creed)"
-    ]
-    files = [
-        "model.py",
-        "trainer.py",
-        "data_loader.py",
-        "utils.py",
-        "metrics.py"
-    ]
     return {
         "type": "creed_violation",
-        "timestamp": datetime.now().isoformat(),
-        "violation": random.choice(violations),
-        "file": random.choice(files),
+        "timestamp": datetime.now(),
+        "violation": next(_violation_picks),
+        "file": next(_file_picks),
         "line": random.randint(10, 500),
         "severity": "error"
     }
 
 def generate_plan_critique_event():
     """Generate a sample plan critique event."""
-    issues = [
-        "Plan lacks specific test cases",
-        "Multiple changes proposed at once",
-        "Solution is overly complex",
-        "Edge cases not considered",
-        "No verification steps included"
-    ]
+    now = datetime.now()
     return {
         "type": "plan_critique",
-        "timestamp": datetime.now().isoformat(),
-        "scroll_path": f".scrolls/{datetime.now().strftime('%m-%d-%H%M')}-fix-plan.md",
+        "timestamp": now,
+        "scroll_path": f".scrolls/{now.strftime('%m-%d-%H%M')}-fix-plan.md",
         "score": random.randint(50, 95),
-        "issues": random.sample(issues, k=random.randint(1, 3)),
+        "issues": random.sample(SAMPLE_PLAN_ISSUES, k=random.randint(1, 3)),
         "severity": "warning" if random.random() > 0.5 else "info"
     }
 
 def generate_metric_drift_event():
     """Generate a sample metric drift event."""
-    metrics = ["qed_score", "sa_score", "loss"]
-    metric = random.choice(metrics)
+    metric = next(_metric_picks)
     prev_value = round(random.uniform(0.6, 0.8), 4)
     drift = round(random.uniform(0.05, 0.15), 4)
     
@@ -101,7 +158,7 @@ def generate_metric_drift_event():
     
     return {
         "type": "metric_drift",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(),
         "metric": metric,
         "prev_value": prev_value,
         "current_value": current_value,
@@ -114,7 +171,7 @@ def generate_cycle_complete_event():
     """Generate a sample cycle complete event."""
     return {
         "type": "cycle_complete",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(),
         "duration": f"{random.randint(5, 60)}m {random.randint(0, 59)}s",
         "changes_made": random.randint(0, 5),
         "issues_found": random.randint(0, 3),
@@ -130,15 +187,148 @@ EVENT_GENERATORS = {
     "cycle_complete": generate_cycle_complete_event
 }
 
+def sse_frame(events):
+    """
+    Serialize a batch of events into a complete SSE data frame.
+    
+    Args:
+        events: List of event dictionaries, sent as one JSON array.
+        
+    Returns:
+        The encoded frame, ready to write to a client.
+    """
+    return SSE_PREFIX + json_bytes(events) + SSE_SUFFIX
+
+# Static pages, encoded once at import time
+INDEX_HTML = """\
+<html>
+    <head>
+        <title>Shihan MCP SSE Gateway</title>
+    </head>
+    <body>
+        <h1>Shihan MCP SSE Gateway</h1>
+        <p>This is a demonstration of the SSE gateway for Shihan MCP.</p>
+        <p>Visit <a href="/dashboard">the dashboard</a> to see events in real-time.</p>
+    </body>
+</html>
+""".encode('utf-8')
+
+DASHBOARD_HTML = """\
+<html>
+    <head>
+        <title>Shihan MCP Dashboard</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+            h1 { color: #333; }
+            #events { margin-top: 20px; }
+            .event { margin-bottom: 10px; padding: 10px; border-radius: 5px; }
+            .info { background-color: #e3f2fd; }
+            .warning { background-color: #fff9c4; }
+            .error, .critical { background-color: #ffebee; }
+            .event-time { font-size: 0.8em; color: #666; }
+            .event-type { font-weight: bold; }
+            .event-details { margin-top: 5px; }
+        </style>
+    </head>
+    <body>
+        <h1>Shihan MCP Dashboard</h1>
+        <p>Real-time events from Shihan MCP:</p>
+        <div id="events"></div>
+
+        <script>
+            const eventsDiv = document.getElementById('events');
+            const eventSource = new EventSource('/events');
+
+            eventSource.onmessage = function(event) {
+                // Each message carries a batch of events
+                JSON.parse(event.data).forEach(showEvent);
+            };
+
+            function showEvent(eventData) {
+                const eventDiv = document.createElement('div');
+                eventDiv.className = `event ${eventData.severity || 'info'}`;
+
+                const eventTime = document.createElement('div');
+                eventTime.className = 'event-time';
+                eventTime.textContent = new Date(eventData.timestamp).toLocaleString();
+
+                const eventType = document.createElement('div');
+                eventType.className = 'event-type';
+                eventType.textContent = eventData.type.replace(/_/g, ' ').toUpperCase();
+
+                const eventDetails = document.createElement('div');
+                eventDetails.className = 'event-details';
+                eventDetails.textContent = JSON.stringify(eventData, null, 2);
+
+                eventDiv.appendChild(eventTime);
+                eventDiv.appendChild(eventType);
+                eventDiv.appendChild(eventDetails);
+
+                eventsDiv.insertBefore(eventDiv, eventsDiv.firstChild);
+            }
+
+            eventSource.onerror = function() {
+                console.error('EventSource failed');
+            };
+        </script>
+    </body>
+</html>
+""".encode('utf-8')
+
+# Let browsers cache the static pages
+STATIC_HEADERS = {'Cache-Control': 'public, max-age=3600'}
+
+# zlib window bits that select the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+def _wants_gzip(request):
+    """
+    Decide whether to gzip an SSE stream for this request.
+    
+    Loopback clients, such as a local dashboard, are sent uncompressed
+    since compression only costs CPU there.
+    
+    Args:
+        request: The incoming aiohttp request.
+        
+    Returns:
+        True if the stream should be gzip-encoded.
+    """
+    if 'gzip' not in request.headers.get('Accept-Encoding', ''):
+        return False
+    
+    try:
+        return not ipaddress.ip_address(request.remote).is_loopback
+    except ValueError:
+        return True
+
 # SSE Gateway implementation
 class SSEGateway:
     """
     Server-Sent Events gateway for Shihan MCP.
     """
     
-    def __init__(self):
-        """Initialize the SSE gateway."""
-        self.clients = set()
+    def __init__(self, batch_window=BATCH_WINDOW):
+        """
+        Initialize the SSE gateway.
+        
+        Args:
+            batch_window: Seconds to collect events before sending them
+                to clients as a single SSE message.
+        """
+        # Events waiting for the next batch, flushed by _flush_pending
+        self.batch_window = batch_window
+        self._pending = []
+        self._has_pending = asyncio.Event()
+        
+        # Recent frames shared by every client, with the sequence number of
+        # the newest one; clients wait on the condition for new frames
+        self._frames = deque(maxlen=FRAME_BUFFER_SIZE)
+        self._seq = 0
+        self._new_frame = asyncio.Condition()
+        
+        # Connected clients, keyed by id() of their response
+        self.clients = {}
         self.app = web.Application()
         self.app.router.add_get('/', self.index_handler)
         self.app.router.add_get('/events', self.events_handler)
@@ -147,82 +337,19 @@ class SSEGateway:
     async def index_handler(self, request):
         """Handle requests to the index page."""
         return web.Response(
-            text="""
-            <html>
-                <head>
-                    <title>Shihan MCP SSE Gateway</title>
-                </head>
-                <body>
-                    <h1>Shihan MCP SSE Gateway</h1>
-                    <p>This is a demonstration of the SSE gateway for Shihan MCP.</p>
-                    <p>Visit <a href="/dashboard">the dashboard</a> to see events in real-time.</p>
-                </body>
-            </html>
-            """,
-            content_type='text/html'
+            body=INDEX_HTML,
+            content_type='text/html',
+            charset='utf-8',
+            headers=STATIC_HEADERS
         )
     
     async def dashboard_handler(self, request):
         """Handle requests to the dashboard page."""
         return web.Response(
-            text="""
-            <html>
-                <head>
-                    <title>Shihan MCP Dashboard</title>
-                    <style>
-                        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
-                        h1 { color: #333; }
-                        #events { margin-top: 20px; }
-                        .event { margin-bottom: 10px; padding: 10px; border-radius: 5px; }
-                        .info { background-color: #e3f2fd; }
-                        .warning { background-color: #fff9c4; }
-                        .error, .critical { background-color: #ffebee; }
-                        .event-time { font-size: 0.8em; color: #666; }
-                        .event-type { font-weight: bold; }
-                        .event-details { margin-top: 5px; }
-                    </style>
-                </head>
-                <body>
-                    <h1>Shihan MCP Dashboard</h1>
-                    <p>Real-time events from Shihan MCP:</p>
-                    <div id="events"></div>
-                    
-                    <script>
-                        const eventsDiv = document.getElementById('events');
-                        const eventSource = new EventSource('/events');
-                        
-                        eventSource.onmessage = function(event) {
-                            const eventData = JSON.parse(event.data);
-                            const eventDiv = document.createElement('div');
-                            eventDiv.className = `event ${eventData.severity || 'info'}`;
-                            
-                            const eventTime = document.createElement('div');
-                            eventTime.className = 'event-time';
-                            eventTime.textContent = new Date(eventData.timestamp).toLocaleString();
-                            
-                            const eventType = document.createElement('div');
-                            eventType.className = 'event-type';
-                            eventType.textContent = eventData.type.replace(/_/g, ' ').toUpperCase();
-                            
-                            const eventDetails = document.createElement('div');
-                            eventDetails.className = 'event-details';
-                            eventDetails.textContent = JSON.stringify(eventData, null, 2);
-                            
-                            eventDiv.appendChild(eventTime);
-                            eventDiv.appendChild(eventType);
-                            eventDiv.appendChild(eventDetails);
-                            
-                            eventsDiv.insertBefore(eventDiv, eventsDiv.firstChild);
-                        };
-                        
-                        eventSource.onerror = function() {
-                            console.error('EventSource failed');
-                        };
-                    </script>
-                </body>
-            </html>
-            """,
-            content_type='text/html'
+            body=DASHBOARD_HTML,
+            content_type='text/html',
+            charset='utf-8',
+            headers=STATIC_HEADERS
         )
     
     async def events_handler(self, request):
@@ -231,42 +358,129 @@ class SSEGateway:
         response.headers['Content-Type'] = 'text/event-stream'
         response.headers['Cache-Control'] = 'no-cache'
         response.headers['Connection'] = 'keep-alive'
+        
+        # Stop nginx-style reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        
+        # Compress for remote clients that accept it; every frame is
+        # sync-flushed so events are never held back inside zlib
+        compressor = None
+        if _wants_gzip(request):
+            compressor = zlib.compressobj(wbits=GZIP_WBITS)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
+        
+        def encode(data):
+            if compressor:
+                return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            return data
+        
         await response.prepare(request)
+        client_id = id(response)
+        self.clients[client_id] = response
         
-        # Register this client
-        client_queue = asyncio.Queue()
-        self.clients.add(client_queue)
+        # Only frames broadcast after this client connected are sent
+        next_seq = self._seq + 1
         
         try:
             # Send initial message
-            await response.write(
-                f"data: {json.dumps({'type': 'connection_established', 'timestamp': datetime.now().isoformat()})}\n\n".encode('utf-8')
-            )
+            await self._write(response, encode(
+                sse_frame([{'type': 'connection_established', 'timestamp': datetime.now()}])
+            ))
             
             # Keep the connection open and send events
             while True:
-                event = await client_queue.get()
-                await response.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
-        
+                async with self._new_frame:
+                    await self._new_frame.wait_for(lambda: self._seq >= next_seq)
+                    frames = self._frames_since(next_seq)
+                    dropped = self._seq + 1 - next_seq - len(frames)
+                    next_seq = self._seq + 1
+                
+                # Frames that rotated out of the buffer are skipped, not queued
+                if dropped:
+                    print(f"Client {request.remote} fell behind, dropped {dropped} frames")
+                
+                # Write outside the lock so a slow client never holds up the others
+                await self._write(response, encode(b"".join(frames)))
+        except ConnectionResetError:
+            pass
+        except asyncio.TimeoutError:
+            print(f"Dropping slow client {request.remote}")
+            request.transport.close()
         finally:
-            # Remove this client when the connection is closed
-            self.clients.remove(client_queue)
+            del self.clients[client_id]
         
         return response
     
+    async def _write(self, response, data):
+        """
+        Write data to a client, giving up if the client stops reading.
+        
+        Args:
+            response: The client's stream response.
+            data: The bytes to write.
+            
+        Raises:
+            asyncio.TimeoutError: If the write does not complete within
+                SLOW_CLIENT_TIMEOUT seconds.
+        """
+        await asyncio.wait_for(response.write(data), SLOW_CLIENT_TIMEOUT)
+    
+    def _frames_since(self, seq):
+        """
+        Get the buffered frames from sequence number seq onwards.
+        
+        Frames that have already rotated out of the buffer are skipped.
+        
+        Args:
+            seq: Sequence number of the first frame wanted.
+            
+        Returns:
+            A list of frames, oldest first.
+        """
+        oldest_seq = self._seq - len(self._frames) + 1
+        start = max(seq, oldest_seq) - oldest_seq
+        return list(islice(self._frames, start, None))
+    
     async def broadcast_event(self, event):
-        """Broadcast an event to all connected clients."""
-        for client_queue in self.clients:
-            await client_queue.put(event)
+        """Queue an event for the next batch sent to all connected clients."""
+        self._pending.append(event)
+        self._has_pending.set()
+    
+    async def _flush_pending(self):
+        """Send queued events to all clients as one frame per batch window."""
+        while True:
+            await self._has_pending.wait()
+            
+            # Let rapidly arriving events collect into the same batch
+            await asyncio.sleep(self.batch_window)
+            batch, self._pending = self._pending, []
+            self._has_pending.clear()
+            
+            await self._publish(sse_frame(batch))
+    
+    async def _publish(self, frame):
+        """
+        Publish a frame to all connected clients.
+        
+        Args:
+            frame: The encoded SSE frame, shared by every client.
+        """
+        # Publish the frame once and wake every waiting client
+        async with self._new_frame:
+            self._frames.append(frame)
+            self._seq += 1
+            self._new_frame.notify_all()
     
     async def generate_random_events(self):
         """Generate random events for demonstration purposes."""
+        event_types = buffered_choices(EVENT_TYPES)
         while True:
             # Wait a random amount of time
             await asyncio.sleep(random.uniform(2, 5))
             
             # Generate a random event
-            event_type = random.choice(EVENT_TYPES)
+            event_type = next(event_types)
             event = EVENT_GENERATORS[event_type]()
             
             # Broadcast the event
@@ -275,7 +489,8 @@ class SSEGateway:
     
     async def start(self, host='localhost', port=8080):
         """Start the SSE gateway."""
-        # Start the event generator
+        # Start the batch flusher and the event generator
+        asyncio.create_task(self._flush_pending())
         asyncio.create_task(self.generate_random_events())
         
         # Start the web server
@@ -302,4 +517,8 @@ async def main():
     await gateway.start()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv event loop when it is installed
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
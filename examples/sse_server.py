@@ -11,11 +11,19 @@ This script demonstrates how to:
 import asyncio
 import json
 import subprocess
-import time
 import sys
 from mcp.client.sse import sse_client
 from mcp import ClientSession, SSEServerParameters
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# How often, and how many times, to probe the server port during startup
+STARTUP_PROBE_INTERVAL = 0.1
+STARTUP_PROBE_ATTEMPTS = 50
+
 async def start_sse_server():
     """
     Start Shihan MCP as an SSE server.
@@ -33,9 +41,19 @@ async def start_sse_server():
         text=True
     )
     
-    # Wait for the server to start
+    # Wait for the server to start accepting connections
     print("⏳ Waiting for server to start...")
-    time.sleep(2)
+    for _ in range(STARTUP_PROBE_ATTEMPTS):
+        try:
+            _, writer = await asyncio.open_connection("localhost", 8000)
+        except OSError:
+            await asyncio.sleep(STARTUP_PROBE_INTERVAL)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        break
+    else:
+        print("⚠️ Server did not accept connections in time")
     
     return process
 
@@ -103,4 +121,8 @@ async def main():
         print("✅ Server stopped")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv event loop when it is installed
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
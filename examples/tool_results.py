@@ -0,0 +1,30 @@
+"""
+Helpers shared by the examples for reading Shihan MCP tool call results.
+"""
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+def parse_tool_result(resp):
+    """
+    Extract the payload from a tool call result.
+    
+    Prefers the structured content that the server already decoded, and only
+    falls back to parsing the first text block as JSON.
+    
+    Args:
+        resp: The CallToolResult returned by the session.
+        
+    Returns:
+        The tool's result as a dictionary.
+    """
+    structured = getattr(resp, "structuredContent", None)
+    
+    # Tools that return a bare string are wrapped as {"result": ...}; their
+    # payload still lives in the text block
+    if structured and set(structured) != {"result"}:
+        return structured
+    
+    return json_loads(resp.content[0].text)
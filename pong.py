@@ -13,18 +13,36 @@ def main(stdscr):
     # Initialize scores
     score_user = 0
     score_comp = 0
+    # Draw the static frame once; the loop only repaints cells that change
+    stdscr.border()
+    stdscr.addstr(0, 2, f"User: {score_user}")
+    stdscr.addstr(0, w-12, f"CPU: {score_comp}")
+    # Draw paddle (triple original width: 9 units)
+    for dx in range(-4, 5):
+        stdscr.addch(h-2, paddle_x+dx, curses.ACS_CKBOARD)
+    prev_ball_x, prev_ball_y = ball_x, ball_y
+    prev_paddle_x = paddle_x
+    prev_scores = (score_user, score_comp)
     while True:
-        stdscr.clear()
-        stdscr.border()
-        # Display scores
-        stdscr.addstr(0, 2, f"User: {score_user}")
-        stdscr.addstr(0, w-12, f"CPU: {score_comp}")
-        # Draw paddle (triple original width: 9 units)
-        for dx in range(-4, 5):
-            stdscr.addch(h-2, paddle_x+dx, curses.ACS_CKBOARD)
+        # Erase the ball where it was last drawn
+        stdscr.addch(prev_ball_y, prev_ball_x, ' ')
+        # Redraw the paddle if it moved or the ball passed over it
+        if paddle_x != prev_paddle_x or prev_ball_y == h-2:
+            for dx in range(-4, 5):
+                if abs(prev_paddle_x + dx - paddle_x) > 4:
+                    stdscr.addch(h-2, prev_paddle_x+dx, ' ')
+                stdscr.addch(h-2, paddle_x+dx, curses.ACS_CKBOARD)
         # Draw ball
         stdscr.addch(ball_y, ball_x, 'O')
-        stdscr.refresh()
+        # Display scores only when they change
+        if (score_user, score_comp) != prev_scores:
+            stdscr.addstr(0, 2, f"User: {score_user}")
+            stdscr.addstr(0, w-12, f"CPU: {score_comp}")
+            prev_scores = (score_user, score_comp)
+        prev_ball_x, prev_ball_y = ball_x, ball_y
+        prev_paddle_x = paddle_x
+        stdscr.noutrefresh()
+        curses.doupdate()
         time.sleep(speed)
         # Handle input
         try:
@@ -36,13 +54,10 @@ def main(stdscr):
             paddle_x -= 2
         elif key == curses.KEY_RIGHT and paddle_x < w-5:
             paddle_x += 2
-        # Move ball with improper fallback (forbidden)
-        if ball_x is None:
-            ball_x = 0  # fallback, should not use
-        ball_x += dir_x
-        ball_y += dir_y
+        # Move ball
+        ball_x, ball_y = ball_x + dir_x, ball_y + dir_y
         # Bounce off side walls
-        if ball_x <= 1 or ball_x >= w-2:
+        if not 1 < ball_x < w-2:
             dir_x *= -1
         # Top miss: user scores
         if ball_y <= 1:
@@ -1,37 +1,51 @@
-import http.client
-import urllib
-import json
+import re
 import time
+import argparse
 import markdown
+import asyncio
+import requests
 import sys
 import random
 import datetime  # Add this for timestamping logs
 
-# Setup logging
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Setup logging; the log file is opened once and line-buffered
+_log_file = open("pushover.log", "a", buffering=1)
+
 def log_message(message):
     """Log a message with timestamp to both stdout and the log file"""
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_msg = f"[{timestamp}] {message}"
     print(log_msg)
-    with open("pushover.log", "a") as log_file:
-        log_file.write(log_msg + "\n")
+    _log_file.write(log_msg + "\n")
 
 # Parse command line arguments
 log_message(f"Command line arguments: {sys.argv}")
 page = False
 custom_sound = None
 
-# Process arguments
-args = sys.argv.copy()
-for i, arg in enumerate(args):
-    if arg == "--page" and i < len(args):
-        page = True
-        sys.argv.remove("--page")
-        log_message("Page mode enabled")
-    elif arg.startswith("--sound=") and i < len(args):
-        custom_sound = arg.split("=")[1]
-        sys.argv.remove(arg)
-        log_message(f"Custom sound specified: {custom_sound}")
+# Process arguments; positionals are left in remaining_args for __main__.
+# Only the exact flags are taken, and a --sound without a value falls back
+# to the default sound rather than exiting, even on import.
+parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+parser.add_argument("--page", action="store_true")
+parser.add_argument("--sound", dest="sound", nargs="?")
+parsed_args, remaining_args = parser.parse_known_args()
+if parsed_args.page:
+    page = True
+    log_message("Page mode enabled")
+if parsed_args.sound:
+    custom_sound = parsed_args.sound
+    log_message(f"Custom sound specified: {custom_sound}")
 
 # Set sound based on parameters
 if custom_sound:
@@ -47,44 +61,123 @@ else:
 APP_TOKEN = "azottw766yxy7oz3vsu2oz432brx8f"
 USER_KEY = "uqek4s2jo8pmrkskp96ravqb85yr15"
 
+# One keep-alive session shared by every sender, so only the first message
+# pays for the TLS handshake
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+_session = requests.Session()
+_session.headers["Connection"] = "keep-alive"
+
+# Parameters shared by every message, built once
+BASE_PARAMS = {"token": APP_TOKEN, "user": USER_KEY}
+
+# Plan sounds by default, question sounds if --page is given
+SOUND_PARAMS = {**BASE_PARAMS, "sound": sound}
+
+# Markdown converter, built once and reset between messages
+_MD = markdown.Markdown(output_format="html")
+
+# Pushover only supports: <b>, <i>, <u>, <font>, <a>
+PUSHOVER_TAGS = {
+    '<h1>': '<b>',
+    '</h1>': '</b>\n\n',
+    '<h2>': '<b>',
+    '</h2>': '</b>\n\n',
+    '<strong>': '<b>',
+    '</strong>': '</b>',
+    '<em>': '<i>',
+    '</em>': '</i>',
+    '<code>': '<i>',
+    '</code>': '</i>',
+    '<li>': '• ',
+    '</li>': '\n',
+    '<ul>': '\n',
+    '</ul>': '\n',
+    '<pre>': '',
+    '</pre>': '',
+}
+PUSHOVER_TAG_RE = re.compile(r'</?(?:h1|h2|strong|em|code|li|ul|pre)>')
+
+def _post(params):
+    """Post a message to Pushover and decode the JSON response"""
+    return json_loads(_session.post(PUSHOVER_URL, data=params).content)
+
+def _post_logged(params):
+    """Post a message to Pushover, logging the response or the error"""
+    log_message(f"Adding sound: {params['sound']}")
+    try:
+        result = _post(params)
+        log_message(f"Response: {result}")
+        return result
+    except Exception as e:
+        log_message(f"Error sending message: {str(e)}")
+        return {"status": 0, "error": str(e)}
+
 def send_basic_message(message, title=None):
     """Send a basic message to Pushover"""
     log_message(f"Sending basic message: {title if title else 'No title'}")
-    conn = http.client.HTTPSConnection("api.pushover.net:443")
+    params = {**SOUND_PARAMS, "message": message}
     
-    params = {
-        "token": APP_TOKEN,
-        "user": USER_KEY,
-        "message": message,
-    }
+    if title:
+        params["title"] = title
+    
+    return _post_logged(params)
+
+# aiohttp session for the async senders, created on first use inside the
+# running event loop
+_async_session = None
+
+async def _get_async_session():
+    """Get the shared aiohttp session, creating it on first use"""
+    global _async_session
+    if not aiohttp:
+        raise RuntimeError("aiohttp is required for the async senders")
+    if not _async_session:
+        _async_session = aiohttp.ClientSession(headers={"Connection": "keep-alive"})
+    return _async_session
+
+async def close_async_session():
+    """Close the shared aiohttp session, if one was opened"""
+    global _async_session
+    if _async_session:
+        await _async_session.close()
+        _async_session = None
+
+async def send_basic_message_async(message, title=None):
+    """Send a basic message to Pushover without blocking the event loop"""
+    log_message(f"Sending basic message: {title if title else 'No title'}")
+    params = {**SOUND_PARAMS, "message": message}
     
     if title:
         params["title"] = title
-        
-    # Always add sound parameter - plan sounds by default, question sounds if --page is given
-    params["sound"] = sound
-    log_message(f"Adding sound: {sound}")
-        
+    
     try:
-        conn.request("POST", "/1/messages.json",
-                    urllib.parse.urlencode(params),
-                    {"Content-type": "application/x-www-form-urlencoded"})
-        
-        response = conn.getresponse()
-        result = json.loads(response.read().decode())
+        session = await _get_async_session()
+        async with session.post(PUSHOVER_URL, data=params) as response:
+            result = json_loads(await response.read())
         log_message(f"Response: {result}")
         return result
     except Exception as e:
         log_message(f"Error sending message: {str(e)}")
         return {"status": 0, "error": str(e)}
 
+async def send_basic_messages_async(messages):
+    """
+    Send several basic messages to Pushover concurrently.
+    
+    Args:
+        messages: Iterable of (message, title) pairs.
+        
+    Returns:
+        The Pushover responses, in the same order as messages.
+    """
+    return await asyncio.gather(
+        *(send_basic_message_async(message, title) for message, title in messages)
+    )
+
 def send_emergency_message(message, title=None):
     """Send an emergency priority message that requires acknowledgment"""
-    conn = http.client.HTTPSConnection("api.pushover.net:443")
-    
     params = {
-        "token": APP_TOKEN,
-        "user": USER_KEY,
+        **BASE_PARAMS,
         "message": message,
         "priority": 2,  # Emergency priority
         "retry": 30,    # Retry every 30 seconds
@@ -93,58 +186,29 @@ def send_emergency_message(message, title=None):
     
     if title:
         params["title"] = title
-        
-    conn.request("POST", "/1/messages.json",
-                urllib.parse.urlencode(params),
-                {"Content-type": "application/x-www-form-urlencoded"})
     
-    response = conn.getresponse()
-    return json.loads(response.read().decode())
+    return _post(params)
 
 def send_html_message(message, title=None):
     """Send a message with HTML formatting"""
-    conn = http.client.HTTPSConnection("api.pushover.net:443")
-    
-    params = {
-        "token": APP_TOKEN,
-        "user": USER_KEY,
-        "message": message,
-        "html": 1,
-    }
+    params = {**BASE_PARAMS, "message": message, "html": 1}
     
     if title:
         params["title"] = title
-        
-    conn.request("POST", "/1/messages.json",
-                urllib.parse.urlencode(params),
-                {"Content-type": "application/x-www-form-urlencoded"})
     
-    response = conn.getresponse()
-    return json.loads(response.read().decode())
+    return _post(params)
 
 def send_url_message(message, url, url_title=None, title=None):
     """Send a message with a supplementary URL"""
-    conn = http.client.HTTPSConnection("api.pushover.net:443")
-    
-    params = {
-        "token": APP_TOKEN,
-        "user": USER_KEY,
-        "message": message,
-        "url": url,
-    }
+    params = {**BASE_PARAMS, "message": message, "url": url}
     
     if url_title:
         params["url_title"] = url_title
     
     if title:
         params["title"] = title
-        
-    conn.request("POST", "/1/messages.json",
-                urllib.parse.urlencode(params),
-                {"Content-type": "application/x-www-form-urlencoded"})
     
-    response = conn.getresponse()
-    return json.loads(response.read().decode())
+    return _post(params)
 
 def send_markdown_message(markdown_text, title=None):
     """Convert markdown to HTML and send as a Pushover message"""
@@ -152,62 +216,22 @@ def send_markdown_message(markdown_text, title=None):
     
     # Convert markdown to HTML
     try:
-        html = markdown.markdown(markdown_text)
+        html = _MD.reset().convert(markdown_text)
         log_message("Markdown converted to HTML successfully")
     except Exception as e:
         log_message(f"Error converting markdown to HTML: {str(e)}")
         return {"status": 0, "error": f"Markdown conversion failed: {str(e)}"}
     
-    # Clean up the HTML for Pushover compatibility
-    # Pushover only supports: <b>, <i>, <u>, <font>, <a>
-    html = (html
-           .replace('<h1>', '<b>')
-           .replace('</h1>', '</b>\n\n')
-           .replace('<h2>', '<b>')
-           .replace('</h2>', '</b>\n\n')
-           .replace('<strong>', '<b>')
-           .replace('</strong>', '</b>')
-           .replace('<em>', '<i>')
-           .replace('</em>', '</i>')
-           .replace('<code>', '<i>')
-           .replace('</code>', '</i>')
-           .replace('<li>', '• ')
-           .replace('</li>', '\n')
-           .replace('<ul>', '\n')
-           .replace('</ul>', '\n')
-           .replace('<pre>', '')
-           .replace('</pre>', '')
-           )
+    # Clean up the HTML for Pushover compatibility in a single pass
+    html = PUSHOVER_TAG_RE.sub(lambda match: PUSHOVER_TAGS[match.group()], html)
     
     # Send the converted HTML message
-    conn = http.client.HTTPSConnection("api.pushover.net:443")
-    
-    params = {
-        "token": APP_TOKEN,
-        "user": USER_KEY,
-        "message": html,
-        "html": 1,
-    }
+    params = {**SOUND_PARAMS, "message": html, "html": 1}
     
     if title:
         params["title"] = title
     
-    # Always add sound parameter - plan sounds by default, question sounds if --page is given
-    params["sound"] = sound
-    log_message(f"Adding sound: {sound}")
-    
-    try:
-        conn.request("POST", "/1/messages.json",
-                    urllib.parse.urlencode(params),
-                    {"Content-type": "application/x-www-form-urlencoded"})
-        
-        response = conn.getresponse()
-        result = json.loads(response.read().decode())
-        log_message(f"Response: {result}")
-        return result
-    except Exception as e:
-        log_message(f"Error sending message: {str(e)}")
-        return {"status": 0, "error": str(e)}
+    return _post_logged(params)
 
 def send_markdown_file(file_path, title=None):
     """Read a markdown file and send it as a Pushover message"""
@@ -222,7 +246,7 @@ def send_markdown_file(file_path, title=None):
         return {"status": 0, "error": f"File read failed: {str(e)}"}
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
+    if len(remaining_args) < 2:
         log_message("Error: Insufficient arguments")
         print("This script is meant to be called from ninja-mail")
         print("Usage: python3 pushover_test.py <markdown_file> <subject> [--page] [--sound=<sound_name>]")
@@ -230,8 +254,8 @@ if __name__ == "__main__":
         print("  --sound=<sound_name>: Use a specific sound (e.g., idle1, idle2, etc.)")
         sys.exit(1)
         
-    markdown_file = sys.argv[1]
-    subject = sys.argv[2]
+    markdown_file = remaining_args[0]
+    subject = remaining_args[1]
     
     log_message(f"Sending markdown file '{markdown_file}' with subject '{subject}'...")
     result = send_markdown_file(markdown_file, subject)
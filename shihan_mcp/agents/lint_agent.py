@@ -1,16 +1,25 @@
 """
 LintAgent - Optional static-analysis LLM for catching subtle tensor mishandling.
 
-This is a placeholder for the future extension mentioned in the shihan_creation.txt.
+This is the extension mentioned in the shihan_creation.txt. It only calls the
+LLM when enabled with SHIHAN_LINT_WITH_LLM and an OpenAI API key is configured.
 """
 
 import os
-from typing import List, Dict, Any, Optional
+import json
+import asyncio
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
-import openai
 
 from ..config import ChatCfg
 
+# Files larger than this are not sent to the LLM
+MAX_LINT_BYTES = 1024 * 1024
+
+# Code without any of these has no tensor operations worth linting
+TENSOR_KEYWORDS = ("torch", "tensorflow", "np.array")
+_TENSOR_KEYWORDS_BYTES = tuple(keyword.encode() for keyword in TENSOR_KEYWORDS)
+
 class LintInput(BaseModel):
     """Input schema for LintAgent."""
     file_path: str = Field(..., description="Path to the file to lint")
@@ -28,17 +37,152 @@ class LintOutput(BaseModel):
     issues: List[LintIssue] = Field(default_factory=list, description="List of lint issues found")
     summary: str = Field(..., description="Summary of the linting results")
 
+class _ArrayItemScanner:
+    """
+    Incrementally pull complete JSON objects out of arrays in a JSON
+    document that arrives in pieces.
+    
+    The LLM may answer with a bare array of issues or wrap it in an object,
+    so any object that is an element of an array is reported.
+    """
+    
+    def __init__(self):
+        """Initialize the scanner with an empty buffer."""
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[Tuple[str, int]] = []
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, text: str) -> List[str]:
+        """
+        Add more of the document and return the array items it completes.
+        
+        Args:
+            text: The next piece of the JSON document.
+            
+        Returns:
+            The JSON source of each object completed by this piece.
+        """
+        self._buffer += text
+        items = []
+        
+        for i in range(self._pos, len(self._buffer)):
+            char = self._buffer[i]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._stack.append((char, i))
+            elif char in '}]' and self._stack:
+                opener, start = self._stack.pop()
+                if opener == '{' and self._stack and self._stack[-1][0] == '[':
+                    items.append(self._buffer[start:i+1])
+        
+        self._pos = len(self._buffer)
+        return items
+    
+    @property
+    def text(self) -> str:
+        """The document received so far."""
+        return self._buffer
+    
+    @property
+    def closed(self) -> bool:
+        """Whether every string and bracket opened so far has been closed."""
+        return not self._stack and not self._in_string
+
+class _IssueParser:
+    """
+    Parse lint issues out of a streamed LLM response as they complete,
+    remembering whether the response as a whole can be trusted.
+    """
+    
+    def __init__(self):
+        """Initialize the parser with nothing received."""
+        self._scanner = _ArrayItemScanner()
+        self._parsed = 0
+        self._error: Optional[Exception] = None
+    
+    def feed(self, chunk: Any) -> List[LintIssue]:
+        """
+        Parse the issues completed by one chunk of the streamed response.
+        
+        Args:
+            chunk: The next streamed chunk.
+            
+        Returns:
+            The issues whose closing brace arrived in this chunk.
+        """
+        if not chunk.choices:
+            return []
+        
+        issues = []
+        for item in self._scanner.feed(chunk.choices[0].delta.content or ""):
+            # Parse and validate in one pass, keeping the first object that
+            # is not a lint issue to report once the response ends
+            try:
+                issues.append(LintIssue.model_validate_json(item))
+            except ValueError as e:
+                self._error = self._error or e
+        self._parsed += len(issues)
+        return issues
+    
+    def finish(self) -> Optional[Exception]:
+        """
+        Check the whole response once it has ended.
+        
+        Returns:
+            Why the response is not a complete list of lint issues, or None
+            if it is.
+        """
+        if self._error:
+            return self._error
+        if self._parsed and self._scanner.closed:
+            return None
+        
+        # Parse the response to find out why it was cut short. With no issues
+        # parsed, it must be an empty list, or an object holding one.
+        try:
+            result = json.loads(self._scanner.text)
+        except ValueError as e:
+            return e
+        
+        if self._parsed or result == [] or (isinstance(result, dict) and [] in result.values()):
+            return None
+        return ValueError(f"Response holds no lint issues: {self._scanner.text[:200]}")
+
 class LintAgent:
     """
     Agent for static-analysis of code to catch subtle tensor mishandling.
     
-    This is a placeholder for the future extension mentioned in the shihan_creation.txt.
+    run lints synchronously. run_async, run_many and stream_issues are for
+    callers with a running event loop.
     """
     
     def __init__(self):
         """Initialize the lint agent."""
         pass
     
+    async def run_many(self, inputs: List[LintInput]) -> List[LintOutput]:
+        """
+        Lint several files concurrently.
+        
+        Args:
+            inputs: The LintInput for each file.
+            
+        Returns:
+            The LintOutput for each file, in the same order as inputs.
+        """
+        return list(await asyncio.gather(*(self.run_async(input_obj) for input_obj in inputs)))
+    
     def run(self, input_obj: LintInput) -> LintOutput:
         """
         Run the lint agent on the specified file or code.
@@ -49,118 +193,241 @@ class LintAgent:
         Returns:
             An instance of LintOutput.
         """
-        # Get the code to lint
-        code = input_obj.code
-        if code is None:
-            # Read the code from the file
-            try:
-                with open(input_obj.file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
-            except Exception as e:
-                return LintOutput(
-                    issues=[],
-                    summary=f"Error reading file: {str(e)}"
-                )
-        
-        # Check if the file is a Python file
-        if not input_obj.file_path.endswith('.py'):
+        code, skip_summary = self._load_code(input_obj)
+        if skip_summary:
             return LintOutput(
                 issues=[],
-                summary="Not a Python file, skipping lint"
+                summary=skip_summary
             )
         
-        # Check if the file contains tensor operations
-        if 'torch' not in code and 'tensorflow' not in code and 'np.array' not in code:
+        issues = list(self._lint_with_llm(code, input_obj.file_path))
+        return LintOutput(
+            issues=issues,
+            summary=f"Found {len(issues)} lint issues in {input_obj.file_path}"
+        )
+    
+    async def run_async(self, input_obj: LintInput) -> LintOutput:
+        """
+        Run the lint agent on the specified file or code without blocking
+        the event loop.
+        
+        Args:
+            input_obj: An instance of LintInput.
+            
+        Returns:
+            An instance of LintOutput.
+        """
+        code, skip_summary = self._load_code(input_obj)
+        if skip_summary:
             return LintOutput(
                 issues=[],
-                summary="No tensor operations found, skipping lint"
+                summary=skip_summary
             )
         
-        # This is where the actual linting would happen
-        # For now, just return a placeholder message
+        issues = [issue async for issue in self._lint_with_llm_async(code, input_obj.file_path)]
         return LintOutput(
-            issues=[],
-            summary="LintAgent is a placeholder for a future extension. It will use an LLM to catch subtle tensor mishandling."
+            issues=issues,
+            summary=f"Found {len(issues)} lint issues in {input_obj.file_path}"
         )
     
-    def _lint_with_llm(self, code: str, file_path: str) -> List[LintIssue]:
+    async def stream_issues(self, input_obj: LintInput) -> AsyncIterator[LintIssue]:
         """
-        Use an LLM to lint the code.
+        Lint the specified file or code, yielding each issue as soon as the
+        LLM has finished writing it.
+        
+        Callers can act on the first serious issue without waiting for the
+        whole response.
+        
+        Args:
+            input_obj: An instance of LintInput.
+            
+        Yields:
+            LintIssue objects, in the order the LLM reports them.
+        """
+        code, skip_summary = self._load_code(input_obj)
+        if skip_summary:
+            return
+        
+        async for issue in self._lint_with_llm_async(code, input_obj.file_path):
+            yield issue
+    
+    def _load_code(self, input_obj: LintInput) -> Tuple[str, str]:
+        """
+        Get the code to lint, or the reason it should be skipped.
+        
+        Args:
+            input_obj: An instance of LintInput.
+            
+        Returns:
+            A tuple of the code and a skip summary; the summary is empty
+            when the code should be linted.
+        """
+        # Check if the file is a Python file, which needs only the path
+        if not input_obj.file_path.endswith('.py'):
+            return "", "Not a Python file, skipping lint"
+        
+        # Get the code to lint, checking it for tensor operations
+        code = input_obj.code
+        if code is None:
+            # Read the code from the file, rejecting it as cheaply as possible:
+            # by size before reading, and by keyword before decoding
+            try:
+                with open(input_obj.file_path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size > MAX_LINT_BYTES:
+                        return "", f"File is too large to lint ({size} bytes), skipping lint"
+                    data = f.read()
+                
+                if not any(keyword in data for keyword in _TENSOR_KEYWORDS_BYTES):
+                    return "", "No tensor operations found, skipping lint"
+                
+                code = data.decode('utf-8')
+            except Exception as e:
+                return "", f"Error reading file: {str(e)}"
+        elif not any(keyword in code for keyword in TENSOR_KEYWORDS):
+            return "", "No tensor operations found, skipping lint"
+        
+        # Until linting with the LLM is enabled, this is a placeholder
+        if not ChatCfg.lint_enabled:
+            return "", "LintAgent is a placeholder for a future extension. It will use an LLM to catch subtle tensor mishandling."
+        
+        # The LLM cannot be called without an API key
+        if not ChatCfg.api_key:
+            return "", "No OpenAI API key configured, skipping lint"
+        
+        return code, ""
+    
+    def _lint_with_llm(self, code: str, file_path: str) -> Iterator[LintIssue]:
+        """
+        Use an LLM to lint the code, streaming its response.
         
         Args:
             code: The code to lint.
             file_path: The path of the file being linted.
             
-        Returns:
-            A list of lint issues.
+        Yields:
+            Lint issues, each as soon as its JSON object is complete, then
+            an error issue if the response was not a list of lint issues.
         """
         # Check if API key is available
         if not ChatCfg.api_key:
-            return []
+            return
         
         try:
-            # Create OpenAI client
-            client = openai.OpenAI(api_key=ChatCfg.api_key)
-            
-            # Prepare the system prompt
-            system_prompt = """
-            You are a Python code linter specialized in tensor operations. Your task is to analyze the code and identify issues
-            related to tensor handling, such as:
-            
-            1. Dimension mismatches
-            2. Incorrect broadcasting
-            3. Inefficient operations
-            4. Memory leaks
-            5. Potential numerical instability
-            6. Unused tensors
-            
-            For each issue, provide:
-            1. The line number
-            2. A description of the issue
-            3. The severity (error, warning, info)
-            
-            Your output must be in the following JSON format:
-            [
-                {
-                    "line": <line_number>,
-                    "column": <column_number or null>,
-                    "message": "<description of the issue>",
-                    "severity": "<error|warning|info>"
-                },
-                ...
-            ]
-            """
-            
-            # Prepare the user prompt
-            user_prompt = f"Here is the code to lint from {file_path}:\n\n{code}"
-            
-            # Call the OpenAI API
-            response = client.chat.completions.create(
-                model=ChatCfg.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=ChatCfg.max_tokens,
-                temperature=0.2,  # Low temperature for more consistent results
-                response_format={"type": "json_object"}
-            )
+            # Reuse the shared client and its open connections
+            stream = ChatCfg.client().chat.completions.create(**self._lint_request(code, file_path))
             
-            # Parse the response
-            lint_result = response.choices[0].message.content
+            parser = _IssueParser()
+            for chunk in stream:
+                yield from parser.feed(chunk)
             
-            # Convert the JSON string to a Python list
-            import json
-            lint_issues = json.loads(lint_result)
+            error = parser.finish()
+            if error:
+                yield self._error_issue(error)
             
-            # Convert to LintIssue objects
-            return [LintIssue(**issue) for issue in lint_issues]
+        except Exception as e:
+            yield self._error_issue(e)
+    
+    async def _lint_with_llm_async(self, code: str, file_path: str) -> AsyncIterator[LintIssue]:
+        """
+        Use an LLM to lint the code, streaming its response without blocking
+        the event loop.
+        
+        Args:
+            code: The code to lint.
+            file_path: The path of the file being linted.
+            
+        Yields:
+            Lint issues, each as soon as its JSON object is complete, then
+            an error issue if the response was not a list of lint issues.
+        """
+        # Check if API key is available
+        if not ChatCfg.api_key:
+            return
+        
+        try:
+            # Reuse the shared client and its open connections
+            stream = await ChatCfg.async_client().chat.completions.create(**self._lint_request(code, file_path))
+            
+            parser = _IssueParser()
+            async for chunk in stream:
+                for issue in parser.feed(chunk):
+                    yield issue
+            
+            error = parser.finish()
+            if error:
+                yield self._error_issue(error)
             
         except Exception as e:
-            return [
-                LintIssue(
-                    line=1,
-                    message=f"Error linting code: {str(e)}",
-                    severity="error"
-                )
-            ]
\ No newline at end of file
+            yield self._error_issue(e)
+    
+    def _lint_request(self, code: str, file_path: str) -> Dict[str, Any]:
+        """
+        Build the streaming chat completion request that lints the code.
+        
+        Args:
+            code: The code to lint.
+            file_path: The path of the file being linted.
+            
+        Returns:
+            The arguments for chat.completions.create.
+        """
+        # Prepare the system prompt
+        system_prompt = """
+        You are a Python code linter specialized in tensor operations. Your task is to analyze the code and identify issues
+        related to tensor handling, such as:
+        
+        1. Dimension mismatches
+        2. Incorrect broadcasting
+        3. Inefficient operations
+        4. Memory leaks
+        5. Potential numerical instability
+        6. Unused tensors
+        
+        For each issue, provide:
+        1. The line number
+        2. A description of the issue
+        3. The severity (error, warning, info)
+        
+        Your output must be in the following JSON format:
+        [
+            {
+                "line": <line_number>,
+                "column": <column_number or null>,
+                "message": "<description of the issue>",
+                "severity": "<error|warning|info>"
+            },
+            ...
+        ]
+        """
+        
+        # Prepare the user prompt
+        user_prompt = f"Here is the code to lint from {file_path}:\n\n{code}"
+        
+        return {
+            "model": ChatCfg.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": ChatCfg.max_tokens,
+            "temperature": 0.2,  # Low temperature for more consistent results
+            "response_format": {"type": "json_object"},
+            "stream": True
+        }
+    
+    def _error_issue(self, error: Exception) -> LintIssue:
+        """
+        Report a failed LLM call as a lint issue.
+        
+        Args:
+            error: The exception raised while linting.
+            
+        Returns:
+            An error-severity LintIssue describing it.
+        """
+        return LintIssue(
+            line=1,
+            message=f"Error linting code: {str(error)}",
+            severity="error"
+        )
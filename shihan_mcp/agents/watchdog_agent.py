@@ -3,16 +3,27 @@ WatchdogAgent - Orchestrates tools to enforce the Creed and supervise Hayato's w
 """
 
 import os
-import glob
+import asyncio
 from typing import List, Optional, Literal
 from pydantic import BaseModel, Field
 
-from ..tools.log_tail import LogSentinelTool
+from ..tools.log_tail import LogSentinelTool, TIMESTAMP_PATTERN, TAIL_BLOCK_SIZE
 from ..tools.creed_audit import CreedAuditTool
 from ..tools.plan_critic import PlanCriticTool
 from ..tools.pager import PagerTool
 from ..config import Paths
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Extensions of the files the watchdog audits
+PYTHON_EXTENSIONS = (".py", ".pyx", ".pyi")
+
+# Most lines of the log checked in one cycle
+LOG_TAIL_LINES = 500
+
 class WatchInput(BaseModel):
     """Input schema for WatchdogAgent."""
     event: Literal["cycle_end", "manual_check", "scroll_committed"] = Field(
@@ -40,6 +51,28 @@ class WatchdogAgent:
         self.creed_audit = CreedAuditTool()
         self.plan_critic = PlanCriticTool()
         self.pager = PagerTool()
+        
+        # The agent builds every tool argument itself, so skip validating them
+        for tool in (self.log_sentinel, self.creed_audit, self.plan_critic, self.pager):
+            tool.validate_input = False
+        
+        # Repository used to list changed files in-process, if pygit2 is installed
+        self._repo = self._open_repo()
+        
+        # (inode, offset, block start) of the log: the offset up to which
+        # previous cycles have read, and where the last block they read
+        # starts, in case an error in it continues past the offset
+        self._log_cursor = (0, 0, 0)
+        
+        # First timestamp seen in the log, which the runtime is measured from
+        self._log_started: Optional[str] = None
+        
+        # Log check result, reused while nothing is appended to the log
+        self._log_result: Optional[dict] = None
+        
+        # Lets one async run at a time use the cursor and the tools' caches;
+        # created on first use, inside the running event loop
+        self._run_lock: Optional[asyncio.Lock] = None
     
     def run(self, input_obj: WatchInput) -> WatchOutput:
         """
@@ -47,7 +80,7 @@ class WatchdogAgent:
         
         Args:
             input_obj: An instance of WatchInput.
-            
+        
         Returns:
             An instance of WatchOutput.
         """
@@ -61,14 +94,14 @@ class WatchdogAgent:
             actions_taken.extend(result["actions_taken"])
             issues_found.extend(result["issues_found"])
             paged = result["paged"]
-            
+        
         elif input_obj.event == "scroll_committed" and input_obj.scroll_path:
             # Handle scroll committed event
             result = self._handle_scroll_committed(input_obj.scroll_path)
             actions_taken.extend(result["actions_taken"])
             issues_found.extend(result["issues_found"])
             paged = result["paged"]
-            
+        
         elif input_obj.event == "manual_check":
             # Handle manual check event
             result = self._handle_manual_check()
@@ -83,6 +116,36 @@ class WatchdogAgent:
             paged=paged
         )
     
+    async def run_async(self, input_obj: WatchInput) -> WatchOutput:
+        """
+        Run the watchdog agent without blocking the event loop.
+        
+        The tools are synchronous, so they run in worker threads. For a
+        manual check, the log check and the scroll critique share no data
+        and run concurrently.
+        
+        Args:
+            input_obj: An instance of WatchInput.
+        
+        Returns:
+            An instance of WatchOutput.
+        """
+        if not self._run_lock:
+            self._run_lock = asyncio.Lock()
+        
+        async with self._run_lock:
+            if input_obj.event != "manual_check":
+                return await asyncio.get_running_loop().run_in_executor(None, self.run, input_obj)
+            
+            result = await self._handle_manual_check_async()
+        
+        return WatchOutput(
+            status="completed",
+            actions_taken=result["actions_taken"],
+            issues_found=result["issues_found"],
+            paged=result["paged"]
+        )
+    
     def _handle_cycle_end(self) -> dict:
         """
         Handle the cycle_end event.
@@ -96,7 +159,7 @@ class WatchdogAgent:
         
         # Step 1: Check the log for errors
         actions_taken.append("Checking log for errors")
-        log_result = self.log_sentinel.run({"tail_lines": 500})
+        log_result = self._check_log()
         
         if log_result.get("last_error"):
             # Error found in log
@@ -163,7 +226,7 @@ class WatchdogAgent:
         
         Args:
             scroll_path: Path to the ninja scroll that was committed.
-            
+        
         Returns:
             A dictionary with the results of the operation.
         """
@@ -211,21 +274,60 @@ class WatchdogAgent:
         Returns:
             A dictionary with the results of the operation.
         """
-        actions_taken = []
-        issues_found = []
-        paged = False
+        # Pick the latest scroll before checking the log, as the async path
+        # does, so a page written by the log check is not critiqued
+        latest_scroll = self._get_latest_scroll()
         
         # Check the log
         log_result = self._handle_cycle_end()
-        actions_taken.extend(log_result["actions_taken"])
-        issues_found.extend(log_result["issues_found"])
-        paged = log_result["paged"]
         
         # Check the latest scroll if available
+        scroll_result = self._handle_scroll_committed(latest_scroll) if latest_scroll else None
+        
+        return self._merge_manual_check(log_result, latest_scroll, scroll_result)
+    
+    async def _handle_manual_check_async(self) -> dict:
+        """
+        Handle the manual_check event, checking the log and the latest
+        scroll concurrently.
+        
+        Returns:
+            A dictionary with the results of the operation.
+        """
+        loop = asyncio.get_running_loop()
+        
+        # The scroll is picked before the checks start, so a page written by
+        # the log check is not critiqued as the latest scroll
         latest_scroll = self._get_latest_scroll()
-        if latest_scroll:
+        if not latest_scroll:
+            log_result = await loop.run_in_executor(None, self._handle_cycle_end)
+            return self._merge_manual_check(log_result, latest_scroll, None)
+        
+        log_result, scroll_result = await asyncio.gather(
+            loop.run_in_executor(None, self._handle_cycle_end),
+            loop.run_in_executor(None, self._handle_scroll_committed, latest_scroll)
+        )
+        return self._merge_manual_check(log_result, latest_scroll, scroll_result)
+    
+    def _merge_manual_check(self, log_result: dict, latest_scroll: Optional[str],
+                            scroll_result: Optional[dict]) -> dict:
+        """
+        Combine the log and scroll checks of a manual check.
+        
+        Args:
+            log_result: The result of the cycle_end handler.
+            latest_scroll: The latest scroll, if one was found.
+            scroll_result: The result of the scroll_committed handler, if run.
+        
+        Returns:
+            A dictionary with the results of the operation.
+        """
+        actions_taken = list(log_result["actions_taken"])
+        issues_found = list(log_result["issues_found"])
+        paged = log_result["paged"]
+        
+        if scroll_result:
             actions_taken.append(f"Found latest scroll: {latest_scroll}")
-            scroll_result = self._handle_scroll_committed(latest_scroll)
             actions_taken.extend(scroll_result["actions_taken"])
             issues_found.extend(scroll_result["issues_found"])
             paged = paged or scroll_result["paged"]
@@ -238,13 +340,146 @@ class WatchdogAgent:
             "paged": paged
         }
     
+    def _check_log(self) -> dict:
+        """
+        Check the lines appended to the log since the previous cycle.
+        
+        Returns:
+            The result of the log sentinel.
+        """
+        new_log = self._read_new_log(LOG_TAIL_LINES)
+        if new_log == "" and self._log_result:
+            # Nothing new to check, so nothing would change
+            return self._log_result
+        
+        if isinstance(new_log, str):
+            started = self._log_started
+            if not started:
+                first = TIMESTAMP_PATTERN.search(new_log)
+                self._log_started = first.group(0) if first else None
+            self._log_result = self.log_sentinel.analyze(new_log, started).model_dump()
+        else:
+            # The log cannot be read, so let the sentinel report why
+            self._log_result = self.log_sentinel.run({"tail_lines": LOG_TAIL_LINES})
+        
+        return self._log_result
+    
+    def _read_new_log(self, tail_lines: int) -> Optional[str]:
+        """
+        Read the lines appended to the log since the previous cycle.
+        
+        Reading starts at the last block of lines the previous cycle read,
+        unless it ended with a blank line, so an error written across two
+        cycles is read whole. Like a tail, only the last tail_lines complete
+        lines are read, and the first read starts at the start of the log.
+        
+        Args:
+            tail_lines: Most lines to read.
+        
+        Returns:
+            The lines read, "" if no complete line was appended, or None if
+            the log cannot be read.
+        """
+        try:
+            st = os.stat(Paths.LOG)
+        except OSError:
+            self._reset_log()
+            return None
+        
+        ino, offset, block_start = self._log_cursor
+        if st.st_ino != ino or st.st_size < offset:
+            # A new or truncated log, read from its start
+            self._reset_log()
+            ino, offset, block_start = st.st_ino, 0, 0
+        
+        try:
+            with open(Paths.LOG, 'rb') as f:
+                pos = st.st_size
+                data = b""
+                newlines = 0
+                while pos > block_start and newlines <= tail_lines:
+                    step = min(TAIL_BLOCK_SIZE, pos - block_start)
+                    pos -= step
+                    f.seek(pos)
+                    block = f.read(step)
+                    newlines += block.count(b'\n')
+                    data = block + data
+        except OSError:
+            return None
+        
+        # Leave a partly written last line for the next read
+        end = data.rfind(b'\n') + 1
+        if pos + end <= offset:
+            return ""
+        data = data[:end]
+        
+        # Keep the last tail_lines lines
+        start = len(data) - 1
+        for _ in range(tail_lines):
+            start = data.rfind(b'\n', 0, start)
+            if start == -1:
+                break
+        data = data[start+1:]
+        
+        # The next read starts after the last blank line, where errors end
+        last_block = data.rfind(b'\n\n') + 2 if b'\n\n' in data else 0
+        self._log_cursor = (ino, pos + end, pos + start + 1 + last_block)
+        
+        text = data.decode('utf-8', errors='replace')
+        
+        # Translate newlines the way text-mode reads do
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return text
+    
+    def _reset_log(self):
+        """Forget what previous cycles read from the log."""
+        self._log_cursor = (0, 0, 0)
+        self._log_started = None
+        self._log_result = None
+    
+    def _open_repo(self):
+        """
+        Open the git repository containing the working directory with libgit2.
+        
+        Returns:
+            A pygit2.Repository, or None if pygit2 is not installed or the
+            working directory is not in a repository.
+        """
+        if not pygit2:
+            return None
+        
+        try:
+            repo_path = pygit2.discover_repository(os.getcwd())
+            return pygit2.Repository(repo_path) if repo_path else None
+        except pygit2.GitError:
+            return None
+    
     def _get_changed_files(self) -> List[str]:
         """
-        Get a list of changed files using git status.
+        Get a list of changed Python files, like `git diff --name-only HEAD`.
+        
+        Uses libgit2 in-process when available instead of forking git. Like
+        git, HEAD is compared with the working directory through the index,
+        so newly staged files are included.
         
         Returns:
             A list of changed file paths.
         """
+        if self._repo:
+            try:
+                # HEAD to index, merged with index to working directory
+                diff = self._repo.diff("HEAD", cached=True)
+                diff.merge(self._repo.diff())
+                return [
+                    delta.new_file.path for delta in diff.deltas
+                    if delta.new_file.path.endswith(PYTHON_EXTENSIONS)
+                ]
+            except pygit2.GitError:
+                # Stop using libgit2 for this repository and run git instead
+                self._repo = None
+        
         try:
             import subprocess
             result = subprocess.run(
@@ -257,11 +492,11 @@ class WatchdogAgent:
                 # Filter for Python files
                 return [
                     file for file in result.stdout.strip().split("\n")
-                    if file and file.endswith((".py", ".pyx", ".pyi"))
+                    if file and file.endswith(PYTHON_EXTENSIONS)
                 ]
             
             return []
-            
+        
         except Exception:
             return []
     
@@ -273,20 +508,20 @@ class WatchdogAgent:
             The path to the latest scroll, or None if no scrolls are found.
         """
         try:
-            # Get all markdown files in the scrolls directory
-            scrolls_dir = Paths.SCROLLS
-            if not os.path.exists(scrolls_dir):
-                return None
+            # Find the newest markdown file in one pass over the scrolls
+            # directory; glob skipped hidden files, so this does too
+            with os.scandir(Paths.SCROLLS) as entries:
+                latest = max(
+                    (
+                        entry for entry in entries
+                        if entry.name.endswith(".md") and not entry.name.startswith(".")
+                    ),
+                    key=lambda entry: entry.stat().st_mtime,
+                    default=None
+                )
             
-            scrolls = glob.glob(os.path.join(scrolls_dir, "*.md"))
-            
-            if not scrolls:
-                return None
-            
-            # Sort by modification time (newest first)
-            scrolls.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            
-            return scrolls[0]
-            
-        except Exception:
+            return latest.path if latest else None
+        
+        except OSError:
+            # Missing scrolls directory, or a scroll vanished mid-scan
             return None
\ No newline at end of file
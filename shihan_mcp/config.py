@@ -3,6 +3,7 @@ Configuration settings for the Shihan MCP server.
 """
 
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,6 +13,89 @@ class ChatCfg:
     api_key = os.getenv("OPENAI_API_KEY")
     model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # tiny, cheap, good enough
     max_tokens = 4096
+    
+    # LintAgent only sends code to the API when explicitly enabled, since
+    # every lint is a paid request
+    lint_enabled = os.getenv("SHIHAN_LINT_WITH_LLM", "").lower() in ("1", "true", "yes")
+    
+    # Connection pool shared by the OpenAI clients below
+    http_limits = {
+        "max_connections": 64,
+        "max_keepalive_connections": 32,
+        "keepalive_expiry": 30.0,
+    }
+    http_timeout = 60.0
+    
+    # Process-wide OpenAI clients, created on first use so that nothing is
+    # imported or built when no API key is configured
+    _client = None
+    _http_client = None
+    _async_client = None
+    
+    # Held while a client is created, so a request racing the startup
+    # prewarm thread cannot build a second connection pool
+    _client_lock = threading.Lock()
+    
+    @classmethod
+    def client(cls):
+        """
+        Get the shared OpenAI client.
+        
+        Returns:
+            An openai.OpenAI client with a keep-alive connection pool.
+        """
+        if not cls._client:
+            with cls._client_lock:
+                if not cls._client:
+                    import httpx
+                    import openai
+                    cls._http_client = httpx.Client(
+                        limits=httpx.Limits(**cls.http_limits),
+                        timeout=cls.http_timeout
+                    )
+                    cls._client = openai.OpenAI(api_key=cls.api_key, http_client=cls._http_client)
+        return cls._client
+    
+    @classmethod
+    def prewarm(cls) -> bool:
+        """
+        Open a keep-alive connection to the API before the first request
+        needs one, so that request skips the TCP and TLS handshakes.
+        
+        Meant to run in a background thread at startup.
+        
+        Returns:
+            Whether the connection was opened.
+        """
+        import httpx
+        client = cls.client()
+        try:
+            cls._http_client.head(str(client.base_url))
+        except httpx.HTTPError:
+            return False
+        return True
+    
+    @classmethod
+    def async_client(cls):
+        """
+        Get the shared async OpenAI client.
+        
+        Returns:
+            An openai.AsyncOpenAI client with a keep-alive connection pool.
+        """
+        if not cls._async_client:
+            with cls._client_lock:
+                if not cls._async_client:
+                    import httpx
+                    import openai
+                    cls._async_client = openai.AsyncOpenAI(
+                        api_key=cls.api_key,
+                        http_client=httpx.AsyncClient(
+                            limits=httpx.Limits(**cls.http_limits),
+                            timeout=cls.http_timeout
+                        )
+                    )
+        return cls._async_client
 
 class Paths:
     """Path constants used throughout the application."""
@@ -2,8 +2,10 @@
 FastMCP server for Shihan - the supervisor of Hayato the Code Ninja.
 """
 
+import json
 import logging
 import argparse
+import threading
 from mcp.server.fastmcp import FastMCP
 
 from .tools.log_tail import LogSentinelTool
@@ -11,6 +13,7 @@ from .tools.creed_audit import CreedAuditTool
 from .tools.plan_critic import PlanCriticTool
 from .tools.pager import PagerTool
 from .agents.watchdog_agent import WatchdogAgent, WatchInput
+from .config import ChatCfg
 
 # Set up logging
 logging.basicConfig(
@@ -19,6 +22,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Watchdog shared by every supervise_cycle call, so its tools, compiled
+# patterns, and caches are set up once per process
+WATCHDOG = WatchdogAgent()
+
 def main():
     """
     Main entry point for the Shihan MCP server.
@@ -43,6 +50,11 @@ def main():
     )
     args = parser.parse_args()
     
+    # Connect to the OpenAI API in the background, so the first critique
+    # or lint does not wait on the handshake
+    if ChatCfg.api_key:
+        threading.Thread(target=ChatCfg.prewarm, daemon=True).start()
+    
     # Create the MCP server
     logger.info("Starting Shihan MCP server")
     mcp = FastMCP("shihan")
@@ -73,24 +85,23 @@ def main():
             watch_input = WatchInput(**args)
             
             # Run the watchdog agent
-            result = WatchdogAgent().run(watch_input)
+            result = await WATCHDOG.run_async(watch_input)
             
             # Return the result as a JSON string
             return result.model_dump_json()
             
         except Exception as e:
-            logger.error(f"Error supervising cycle: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            # The traceback is only formatted if a handler emits the record
+            logger.exception("Error supervising cycle")
             
             # Return an error message
-            return {
+            return json.dumps({
                 "status": "error",
                 "error": str(e),
                 "actions_taken": [],
                 "issues_found": [f"Internal error: {str(e)}"],
                 "paged": False
-            }
+            })
     
     # Run the server
     if args.serve:
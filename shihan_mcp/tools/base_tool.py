@@ -3,13 +3,16 @@ Base tool class for Shihan MCP tools.
 """
 
 from typing import Any, Dict, Generic, Type, TypeVar
-from pydantic import BaseModel, create_model
+from pydantic import BaseModel
 
 # Type variable for input schema
 I = TypeVar('I', bound=BaseModel)
 # Type variable for output schema
 O = TypeVar('O', bound=BaseModel)
 
+class _EmptySchema(BaseModel):
+    """Schema with no fields, for tools that take or return nothing."""
+
 class BaseTool(Generic[I, O]):
     """
     Base class for all Shihan MCP tools.
@@ -21,15 +24,16 @@ class BaseTool(Generic[I, O]):
     input_schema: Type[I] = None
     output_schema: Type[O] = None
     
+    # Whether run validates its arguments. Callers that build the arguments
+    # themselves can turn this off to skip validation and construct the
+    # input directly.
+    validate_input: bool = True
+    
     def __init__(self):
         """Initialize the tool."""
-        if self.input_schema is None:
-            # Create an empty input schema if none is provided
-            self.input_schema = create_model('EmptyInputSchema', __base__=BaseModel)
-        
-        if self.output_schema is None:
-            # Create an empty output schema if none is provided
-            self.output_schema = create_model('EmptyOutputSchema', __base__=BaseModel)
+        # Use the shared empty schema for any schema that is not provided
+        self.input_schema = self.input_schema or _EmptySchema
+        self.output_schema = self.output_schema or _EmptySchema
     
     def run(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,21 +46,32 @@ class BaseTool(Generic[I, O]):
             A dictionary containing the tool's output.
         """
         # Parse input using the input schema
-        input_obj = self.input_schema(**args)
+        input_obj = self._parse_input(args)
         
         # Run the tool implementation
         output = self._run(input_obj)
         
-        # If output is already a dict, return it
-        if isinstance(output, dict):
-            return output
-        
-        # Otherwise, convert to dict using the output schema
+        # Convert models to a dict; dicts are returned as they are
         if isinstance(output, BaseModel):
             return output.model_dump()
         
-        # If output is not a BaseModel instance, wrap it in the output schema
-        return self.output_schema(**output).model_dump()
+        return output
+    
+    def _parse_input(self, args: Dict[str, Any]) -> I:
+        """
+        Parse arguments into the input schema, validating them unless the
+        caller is trusted.
+        
+        Args:
+            args: A dictionary of arguments to pass to the tool.
+            
+        Returns:
+            An instance of the input schema.
+        """
+        if self.validate_input:
+            return self.input_schema.model_validate(args)
+        
+        return self.input_schema.model_construct(**args)
     
     def _run(self, input_obj: I) -> O:
         """
@@ -4,11 +4,91 @@ CreedAuditTool - Static-analyzes changed files looking for forbidden patterns.
 
 import os
 import re
-from typing import List, Dict, Pattern
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict, Pattern, Tuple, Union
 from pydantic import BaseModel, Field
 
 from .base_tool import BaseTool
 
+# Forbidden patterns, compiled once per process (including pool workers).
+# They are bytes patterns so files can be scanned straight from an mmap.
+FORBIDDEN_PATTERNS: Dict[str, Pattern] = {
+    "is_none": re.compile(rb'\bis\s+None\b'),
+    "is_not_none": re.compile(rb'\bis\s+not\s+None\b'),
+    "kwargs": re.compile(rb'\*\*kwargs'),
+    "mock": re.compile(rb'\bmock\b|\bMagicMock\b'),
+    "if_none_fallback": re.compile(rb'if\s+.*?is\s+None'),
+    "hasattr": re.compile(rb'\bhasattr\b'),
+    "silent_exception": re.compile(rb'except.*?:(\s*)pass'),
+    "unused_tensor": re.compile(rb'torch\.tensor\(.*?\).*?(?!\S)'),
+    "fallback_pattern": re.compile(rb'if\s+.*?:\s*.*?\s*else\s*.*?return\s+0'),
+}
+
+# Literals that every match of each pattern must contain
+PATTERN_ANCHORS: Dict[str, Tuple[bytes, ...]] = {
+    "is_none": (b"None",),
+    "is_not_none": (b"None",),
+    "kwargs": (b"**kwargs",),
+    "mock": (b"mock", b"MagicMock"),
+    "if_none_fallback": (b"None",),
+    "hasattr": (b"hasattr",),
+    "silent_exception": (b"pass",),
+    "unused_tensor": (b"torch.tensor(",),
+    "fallback_pattern": (b"return",),
+}
+
+# One alternation of every anchor, so a single scan of the file finds
+# all the lines that could hold a violation
+_ANCHOR_SCAN: Pattern = re.compile(b"|".join(map(re.escape, dict.fromkeys(
+    anchor for anchors in PATTERN_ANCHORS.values() for anchor in anchors
+))))
+
+# Bytes the patterns above treat differently from the str patterns files
+# were first audited with: CR, which universal newlines make a line break,
+# the ASCII controls str counts as whitespace, and anything non-ASCII. Files
+# holding any of them are decoded and checked with the str patterns below.
+_TEXT_ONLY_BYTES: Pattern = re.compile(rb'[\r\x1c-\x1f\x80-\xff]')
+
+# The patterns, anchors and anchor scan as str, with Unicode \s and \b
+TEXT_PATTERNS: Dict[str, Pattern] = {
+    pattern_name: re.compile(pattern.pattern.decode())
+    for pattern_name, pattern in FORBIDDEN_PATTERNS.items()
+}
+TEXT_ANCHORS: Dict[str, Tuple[str, ...]] = {
+    pattern_name: tuple(anchor.decode() for anchor in anchors)
+    for pattern_name, anchors in PATTERN_ANCHORS.items()
+}
+_TEXT_ANCHOR_SCAN: Pattern = re.compile(_ANCHOR_SCAN.pattern.decode())
+
+# Human-readable descriptions of each pattern
+PATTERN_DESCRIPTIONS: Dict[str, str] = {
+    "is_none": "Using 'is None' check (forbidden by Creed)",
+    "is_not_none": "Using 'is not None' check (forbidden by Creed)",
+    "kwargs": "Using '**kwargs' (forbidden by Creed)",
+    "mock": "Using mock objects (forbidden by Creed)",
+    "if_none_fallback": "Using None fallback pattern (forbidden by Creed)",
+    "hasattr": "Using hasattr() (forbidden by Creed)",
+    "silent_exception": "Silent exception handling (forbidden by Creed)",
+    "unused_tensor": "Potentially unused tensor (forbidden by Creed)",
+    "fallback_pattern": "Using fallback pattern (forbidden by Creed)",
+}
+
+# Fewer files than this are scanned in-process. Workers are not forked, so
+# every pool pays for starting fresh interpreters: about 0.2s measured, as
+# long as scanning some 250 typical files in-process.
+PROCESS_POOL_MIN_FILES = 256
+
+# Files handed to a worker process at a time
+PROCESS_POOL_CHUNKSIZE = 8
+
+# Workers start from a clean process rather than a fork of the server,
+# whose other threads may hold locks a forked child would inherit held
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
 class CreedAuditInput(BaseModel):
     """Input schema for CreedAuditTool."""
     files: List[str] = Field(..., description="List of files to audit")
@@ -17,6 +97,152 @@ class CreedAuditOutput(BaseModel):
     """Output schema for CreedAuditTool."""
     violations: List[str] = Field(default_factory=list, description="List of creed violations found")
 
+def _scan_file(file_path: str) -> Tuple[List[str], bool]:
+    """
+    Read a file and check it for creed violations.
+    
+    Module-level so it can be sent to worker processes. The file is
+    memory-mapped and scanned in place rather than read and decoded, unless
+    it holds bytes that only a text-mode read would handle correctly.
+    
+    Args:
+        file_path: The path of the file to check.
+    
+    Returns:
+        A tuple of the violation messages and whether the file could be read.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            # Empty files cannot be mapped, and have nothing to check
+            if not os.fstat(f.fileno()).st_size:
+                return [], True
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                if not _TEXT_ONLY_BYTES.search(content):
+                    return _check_violations(file_path, content), True
+                
+                # Read it as text mode would: strict UTF-8, universal newlines
+                text = content[:].decode('utf-8')
+        
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return _check_violations(file_path, text), True
+    except Exception as e:
+        return [f"Error reading {file_path}: {str(e)}"], False
+
+def _scan_files(file_paths: List[str]) -> Iterable[Tuple[List[str], bool]]:
+    """
+    Scan files for creed violations, in parallel when there are many.
+    
+    Args:
+        file_paths: The paths of the files to check.
+    
+    Returns:
+        The results of _scan_file for each path, in order.
+    """
+    cpus = os.cpu_count() or 1
+    if len(file_paths) < PROCESS_POOL_MIN_FILES or cpus < 2:
+        return map(_scan_file, file_paths)
+    
+    workers = min(cpus, -(-len(file_paths) // PROCESS_POOL_CHUNKSIZE))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT) as executor:
+        return list(executor.map(_scan_file, file_paths, chunksize=PROCESS_POOL_CHUNKSIZE))
+
+def _check_violations(file_path: str, content: Union[bytes, mmap.mmap, str]) -> List[str]:
+    """
+    Check the content for creed violations.
+    
+    Args:
+        file_path: The path of the file being checked.
+        content: The content of the file, as bytes or a read-only mmap with
+            no bytes matching _TEXT_ONLY_BYTES, or as str with universal
+            newlines.
+    
+    Returns:
+        A list of violation messages.
+    """
+    if isinstance(content, str):
+        patterns, pattern_anchors, anchor_scan = TEXT_PATTERNS, TEXT_ANCHORS, _TEXT_ANCHOR_SCAN
+        newline, comment = '\n', '#'
+    else:
+        patterns, pattern_anchors, anchor_scan = FORBIDDEN_PATTERNS, PATTERN_ANCHORS, _ANCHOR_SCAN
+        newline, comment = b'\n', b'#'
+    
+    # Only patterns whose anchors appear somewhere in the file can match.
+    # find is a memchr-driven search, far cheaper than any regex, so most
+    # files are dismissed without running a single pattern.
+    active = []
+    for pattern_name, pattern in patterns.items():
+        anchors = pattern_anchors[pattern_name]
+        if any(content.find(a) != -1 for a in anchors):
+            active.append((pattern_name, pattern, anchors))
+    if not active:
+        return []
+    
+    # Scan the whole file once for lines containing any anchor. Matches
+    # arrive in file order, so line numbers are found by counting the
+    # newlines between one candidate line and the next rather than by
+    # splitting the file or indexing every newline.
+    hits: Dict[str, List[int]] = {name: [] for name in FORBIDDEN_PATTERNS}
+    lines: Dict[int, Union[bytes, str]] = {}
+    line_index = 0
+    counted_to = 0
+    end = -1
+    for match in anchor_scan.finditer(content):
+        # Further anchors on a line that was already checked
+        if match.start() < end:
+            continue
+        
+        start = content.rfind(newline, 0, match.start()) + 1
+        end = content.find(newline, match.start())
+        if end == -1:
+            end = len(content)
+        line_index += content[counted_to:start].count(newline)
+        counted_to = start
+        line = content[start:end]
+        
+        # Skip comments
+        if line.strip().startswith(comment):
+            continue
+        
+        # Run each pattern only on lines holding one of its anchors
+        for pattern_name, pattern, anchors in active:
+            if any(a in line for a in anchors) and pattern.search(line):
+                hits[pattern_name].append(line_index)
+                lines[line_index] = line
+    
+    # Generate violation messages, grouped by pattern
+    violations = []
+    for pattern_name, line_indexes in hits.items():
+        for i in line_indexes:
+            line = lines[i]
+            if not isinstance(line, str):
+                line = line.decode('utf-8')
+            violation_msg = _format_violation(file_path, i+1, line, pattern_name)
+            violations.append(violation_msg)
+    
+    return violations
+
+def _format_violation(file_path: str, line_num: int, line: str, pattern_name: str) -> str:
+    """
+    Format a violation message.
+    
+    Args:
+        file_path: The path of the file with the violation.
+        line_num: The line number of the violation.
+        line: The line content.
+        pattern_name: The name of the violated pattern.
+    
+    Returns:
+        A formatted violation message.
+    """
+    # Trim the line if it's too long
+    if len(line) > 50:
+        line = line[:47] + "..."
+    
+    description = PATTERN_DESCRIPTIONS.get(pattern_name, f"Violation of {pattern_name}")
+    
+    return f"{file_path}:{line_num}: {description}\n  {line.strip()}"
+
 class CreedAuditTool(BaseTool[CreedAuditInput, CreedAuditOutput]):
     """
     Tool for static-analyzing changed files looking for forbidden patterns.
@@ -29,18 +255,11 @@ class CreedAuditTool(BaseTool[CreedAuditInput, CreedAuditOutput]):
         """Initialize the tool with forbidden patterns."""
         super().__init__()
         
-        # Compile forbidden patterns once
-        self.forbidden_patterns: Dict[str, Pattern] = {
-            "is_none": re.compile(r'\bis\s+None\b'),
-            "is_not_none": re.compile(r'\bis\s+not\s+None\b'),
-            "kwargs": re.compile(r'\*\*kwargs'),
-            "mock": re.compile(r'\bmock\b|\bMagicMock\b'),
-            "if_none_fallback": re.compile(r'if\s+.*?is\s+None'),
-            "hasattr": re.compile(r'\bhasattr\b'),
-            "silent_exception": re.compile(r'except.*?:(\s*)pass'),
-            "unused_tensor": re.compile(r'torch\.tensor\(.*?\).*?(?!\S)'),
-            "fallback_pattern": re.compile(r'if\s+.*?:\s*.*?\s*else\s*.*?return\s+0'),
-        }
+        self.forbidden_patterns = FORBIDDEN_PATTERNS
+        
+        # Violations of files already audited, keyed by path and stored with
+        # the (mtime_ns, size) they were found at
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
     
     def _run(self, input_obj: CreedAuditInput) -> CreedAuditOutput:
         """
@@ -48,96 +267,43 @@ class CreedAuditTool(BaseTool[CreedAuditInput, CreedAuditOutput]):
         
         Args:
             input_obj: An instance of CreedAuditInput.
-            
+        
         Returns:
             An instance of CreedAuditOutput.
         """
-        violations = []
+        # Violations per input file, in input order
+        file_results: List[List[str]] = []
+        
+        # Files that need scanning, with their slot in file_results
+        to_scan: List[Tuple[int, str, Tuple[int, int]]] = []
         
         for file_path in input_obj.files:
             # Skip files that don't exist
-            if not os.path.exists(file_path):
-                violations.append(f"File not found: {file_path}")
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                file_results.append([f"File not found: {file_path}"])
                 continue
             
             # Skip non-Python files
             if not file_path.endswith(('.py', '.pyx', '.pyi')):
                 continue
             
-            # Read the file content
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except Exception as e:
-                violations.append(f"Error reading {file_path}: {str(e)}")
+            # Reuse the result for files unchanged since their last audit
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._file_cache.get(file_path)
+            if cached and cached[0] == stamp:
+                file_results.append(cached[1])
                 continue
             
-            # Check for violations
-            file_violations = self._check_violations(file_path, content)
-            violations.extend(file_violations)
-        
-        return CreedAuditOutput(violations=violations)
-    
-    def _check_violations(self, file_path: str, content: str) -> List[str]:
-        """
-        Check the content for creed violations.
-        
-        Args:
-            file_path: The path of the file being checked.
-            content: The content of the file.
-            
-        Returns:
-            A list of violation messages.
-        """
-        violations = []
-        
-        # Split content into lines for better error reporting
-        lines = content.split('\n')
-        
-        for pattern_name, pattern in self.forbidden_patterns.items():
-            # Find all matches
-            for i, line in enumerate(lines):
-                if pattern.search(line):
-                    # Skip comments
-                    if line.strip().startswith('#'):
-                        continue
-                    
-                    # Generate violation message
-                    violation_msg = self._format_violation(file_path, i+1, line, pattern_name)
-                    violations.append(violation_msg)
-        
-        return violations
-    
-    def _format_violation(self, file_path: str, line_num: int, line: str, pattern_name: str) -> str:
-        """
-        Format a violation message.
-        
-        Args:
-            file_path: The path of the file with the violation.
-            line_num: The line number of the violation.
-            line: The line content.
-            pattern_name: The name of the violated pattern.
-            
-        Returns:
-            A formatted violation message.
-        """
-        # Trim the line if it's too long
-        if len(line) > 50:
-            line = line[:47] + "..."
-        
-        # Map pattern names to human-readable descriptions
-        pattern_descriptions = {
-            "is_none": "Using 'is None' check (forbidden by Creed)",
-            "is_not_none": "Using 'is not None' check (forbidden by Creed)",
-            "kwargs": "Using '**kwargs' (forbidden by Creed)",
-            "mock": "Using mock objects (forbidden by Creed)",
-            "if_none_fallback": "Using None fallback pattern (forbidden by Creed)",
-            "hasattr": "Using hasattr() (forbidden by Creed)",
-            "silent_exception": "Silent exception handling (forbidden by Creed)",
-            "unused_tensor": "Potentially unused tensor (forbidden by Creed)",
-            "fallback_pattern": "Using fallback pattern (forbidden by Creed)",
-        }
+            to_scan.append((len(file_results), file_path, stamp))
+            file_results.append([])
         
-        description = pattern_descriptions.get(pattern_name, f"Violation of {pattern_name}")
+        # Check the remaining files for violations
+        scanned = _scan_files([file_path for _, file_path, _ in to_scan])
+        for (slot, file_path, stamp), (file_violations, was_read) in zip(to_scan, scanned):
+            file_results[slot] = file_violations
+            if was_read:
+                self._file_cache[file_path] = (stamp, file_violations)
         
-        return f"{file_path}:{line_num}: {description}\n  {line.strip()}"
\ No newline at end of file
+        return CreedAuditOutput(violations=[v for result in file_results for v in result])
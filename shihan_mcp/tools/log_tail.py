@@ -2,8 +2,10 @@
 LogSentinelTool - Tails, parses, and summarizes training.log and crash traces.
 """
 
+import os
 import re
-import subprocess
+from collections import deque
+from functools import lru_cache
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -11,6 +13,49 @@ from pydantic import BaseModel, Field
 from ..config import Paths
 from .base_tool import BaseTool
 
+# Markers that start each type of error. An error runs from its marker to
+# the next blank line or the end of the log.
+ERROR_MARKERS = (
+    "Traceback (most recent call last):",
+    "RuntimeError:",
+    "AssertionError:",
+    "Error:",
+)
+
+# Pattern for the timestamps used to compute the runtime. ASCII digits only,
+# which the regex engine matches much faster than any Unicode digit.
+TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', re.ASCII)
+
+# Final lines checked one by one for the last timestamp before falling back
+# to scanning everything after the first
+TIMESTAMP_TAIL_LINES = 16
+
+# Bytes read at a time while searching backwards for the tail's first line
+TAIL_BLOCK_SIZE = 64 * 1024
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp: str) -> datetime:
+    """
+    Parse a log timestamp.
+    
+    TIMESTAMP_PATTERN fixes where every field is, so the fields are sliced
+    out directly rather than interpreted by strptime. Results are cached,
+    since successive polls of the log keep seeing the same timestamps.
+    
+    Args:
+        timestamp: A timestamp matched by TIMESTAMP_PATTERN.
+    
+    Returns:
+        The parsed datetime.
+    
+    Raises:
+        ValueError: If a field is out of range.
+    """
+    return datetime(
+        int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+        int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19])
+    )
+
 class LogSentinelInput(BaseModel):
     """Input schema for LogSentinelTool."""
     tail_lines: int = Field(default=500, description="Number of lines to tail from the log file")
@@ -42,11 +87,28 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
         # Tail the log file
         log_content = self._tail_log(input_obj.tail_lines)
         
+        return self.analyze(log_content)
+    
+    def analyze(self, log_content: str, started: Optional[str] = None) -> LogSentinelOutput:
+        """
+        Parse log content for errors, compute runtime, and summarize it.
+        
+        For callers that read the log themselves, such as the watchdog, which
+        reads only what was appended since its previous check.
+        
+        Args:
+            log_content: The log content to analyze.
+            started: A timestamp to measure the runtime from instead of the
+                first one in the log content, if given.
+            
+        Returns:
+            An instance of LogSentinelOutput.
+        """
         # Parse for errors
         last_error = self._find_last_error(log_content)
         
         # Compute runtime
-        elapsed = self._compute_runtime(log_content)
+        elapsed = self._compute_runtime(log_content, started)
         
         # Generate summary
         summary = self._generate_summary(log_content, last_error, elapsed)
@@ -59,7 +121,8 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
     
     def _tail_log(self, tail_lines: int) -> str:
         """
-        Tail the log file using the tail command.
+        Tail the log file, reading it backwards from the end in blocks until
+        enough lines have been found.
         
         Args:
             tail_lines: Number of lines to tail.
@@ -68,17 +131,37 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
             The tailed log content as a string.
         """
         try:
-            result = subprocess.run(
-                ["tail", "-n", str(tail_lines), Paths.LOG],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout
-        except subprocess.CalledProcessError:
-            return f"Error: Could not tail log file {Paths.LOG}"
+            with open(Paths.LOG, 'rb') as f:
+                pos = f.seek(0, os.SEEK_END)
+                data = b""
+                newlines = 0
+                while pos > 0 and newlines <= tail_lines:
+                    step = min(TAIL_BLOCK_SIZE, pos)
+                    pos -= step
+                    f.seek(pos)
+                    block = f.read(step)
+                    newlines += block.count(b'\n')
+                    data = block + data
         except FileNotFoundError:
             return f"Error: Log file {Paths.LOG} not found"
+        except OSError:
+            return f"Error: Could not tail log file {Paths.LOG}"
+        
+        # Like tail, a final newline ends the last line rather than starting
+        # another, so the tail starts after the newline before its first line
+        start = len(data) - 1 if data.endswith(b'\n') else len(data)
+        for _ in range(tail_lines):
+            start = data.rfind(b'\n', 0, start)
+            if start == -1:
+                break
+        
+        text = data[start+1:].decode('utf-8', errors='replace')
+        
+        # Translate newlines the way text-mode reads do
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return text
     
     def _find_last_error(self, log_content: str) -> Optional[str]:
         """
@@ -90,47 +173,57 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
         Returns:
             The last error found, or None if no error was found.
         """
-        # Regex patterns for different types of errors
-        error_patterns = [
-            r'Traceback \(most recent call last\):.*?(?=\n\n|\Z)',
-            r'RuntimeError:.*?(?=\n\n|\Z)',
-            r'AssertionError:.*?(?=\n\n|\Z)',
-            r'Error:.*?(?=\n\n|\Z)'
-        ]
-        
-        # Find all errors
-        errors = []
-        for pattern in error_patterns:
-            matches = re.finditer(pattern, log_content, re.DOTALL)
-            errors.extend([match.group(0) for match in matches])
-        
-        # Return the last error, if any
-        if errors:
-            return errors[-1]
+        # The last error is the last one of the last type present at all, so
+        # try the markers from last to first, searching back from the end
+        absent = []
+        for marker in reversed(ERROR_MARKERS):
+            # A marker containing one already known to be absent, as the typed
+            # markers contain "Error:", cannot be present either
+            if any(other in marker for other in absent):
+                continue
+            
+            last = log_content.rfind(marker)
+            if last == -1:
+                absent.append(marker)
+                continue
+            
+            # Errors never span a blank line, so the error holding the last
+            # marker starts at the first marker after the blank line before it
+            start = log_content.find(marker, log_content.rfind('\n\n', 0, last) + 1)
+            end = log_content.find('\n\n', start + len(marker))
+            return log_content[start:end] if end != -1 else log_content[start:]
         
         return None
     
-    def _compute_runtime(self, log_content: str) -> str:
+    def _compute_runtime(self, log_content: str, started: Optional[str] = None) -> str:
         """
         Compute the runtime based on the first and last timestamp in the log.
         
         Args:
             log_content: The log content to search.
+            started: A timestamp to use as the first one, if given.
             
         Returns:
             A string representing the elapsed time.
         """
-        # Extract timestamps from the log
-        timestamp_pattern = r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'
-        timestamps = re.findall(timestamp_pattern, log_content)
+        # Find the first and last timestamps. Given a start, the first
+        # timestamp in the log may also be the last.
+        first = TIMESTAMP_PATTERN.search(log_content)
+        if not first:
+            last = None
+        elif started:
+            last = self._find_last_timestamp(log_content, first.start())
+        else:
+            last = self._find_last_timestamp(log_content, first.end())
+            started = first.group(0)
         
-        if len(timestamps) < 2:
+        if not last:
             return "Unknown (insufficient timestamps)"
         
         try:
             # Parse the first and last timestamp
-            first_time = datetime.strptime(timestamps[0], '%Y-%m-%d %H:%M:%S')
-            last_time = datetime.strptime(timestamps[-1], '%Y-%m-%d %H:%M:%S')
+            first_time = _parse_timestamp(started)
+            last_time = _parse_timestamp(last.group(0))
             
             # Compute the difference
             delta = last_time - first_time
@@ -150,6 +243,35 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
         except ValueError:
             return "Unknown (invalid timestamps)"
     
+    def _find_last_timestamp(self, log_content: str, after: int) -> Optional[re.Match]:
+        """
+        Find the last timestamp in the log content.
+        
+        Args:
+            log_content: The log content to search.
+            after: The offset the search starts at, at or after the first timestamp.
+            
+        Returns:
+            The match of the last timestamp, or None if there is none.
+        """
+        # Timestamps are usually on every line, so check the final lines
+        # newest first. Matches never span lines, and a line after the first
+        # timestamp's line is matched from its start as a full scan would.
+        end = len(log_content)
+        for _ in range(TIMESTAMP_TAIL_LINES):
+            start = log_content.rfind('\n', after, end) + 1
+            if not start:
+                break
+            
+            last_match = deque(TIMESTAMP_PATTERN.finditer(log_content, start, end), maxlen=1)
+            if last_match:
+                return last_match[0]
+            end = start - 1
+        
+        # Otherwise scan everything after the first timestamp
+        last_match = deque(TIMESTAMP_PATTERN.finditer(log_content, after), maxlen=1)
+        return last_match[0] if last_match else None
+    
     def _generate_summary(self, log_content: str, last_error: Optional[str], elapsed: str) -> str:
         """
         Generate a summary of the log content.
@@ -165,12 +287,21 @@ class LogSentinelTool(BaseTool[LogSentinelInput, LogSentinelOutput]):
         # Count lines
         line_count = log_content.count('\n') + 1
         
+        # Lowercase once for both case-insensitive counts. Only ASCII letters
+        # are counted, so a non-ASCII log is lowered as UTF-8 bytes, which is
+        # several times faster than lowering a wide str.
+        if log_content.isascii():
+            lowered, warning, error = log_content.lower(), 'warning', 'error'
+        else:
+            lowered = log_content.encode('utf-8', errors='surrogatepass').lower()
+            warning, error = b'warning', b'error'
+        
         # Count warnings
-        warning_count = log_content.lower().count('warning')
+        warning_count = lowered.count(warning)
         
         # Count errors
         error_count = (
-            log_content.lower().count('error') +
+            lowered.count(error) +
             log_content.count('Traceback') +
             log_content.count('Exception')
         )
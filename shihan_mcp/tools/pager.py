@@ -3,13 +3,78 @@ PagerTool - Sends alerts via Pushover or creates a ninja scroll with --page flag
 """
 
 import os
+import asyncio
 import subprocess
 import requests
-from typing import Optional
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 from .base_tool import BaseTool
 
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+
+# Session shared by every page, so pages after the first reuse its open
+# TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Timeout in seconds for each Pushover request
+PUSHOVER_TIMEOUT = 5
+
+# httpx client for the async senders and the event loop it was created in;
+# created on first use inside the running loop
+_async_client = None
+_async_client_loop = None
+
+async def _get_async_client():
+    """
+    Get the shared httpx client for the running event loop.
+    
+    A client made in another loop cannot be used in this one, so it is
+    closed and replaced.
+    
+    Returns:
+        An httpx.AsyncClient whose connections are reused across pages.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client and _async_client_loop is not loop:
+        old_client, _async_client = _async_client, None
+        try:
+            await old_client.aclose()
+        except RuntimeError as e:
+            # Its loop is already closed, and its sockets with it
+            print(f"Note: Could not close the previous Pushover client: {str(e)}")
+    
+    if not _async_client:
+        import httpx
+        _async_client = httpx.AsyncClient(timeout=PUSHOVER_TIMEOUT)
+        _async_client_loop = loop
+    return _async_client
+
+# Characters of a page title replaced or removed to make a filename
+_TITLE_TABLE = str.maketrans({' ': '-', ':': None, '/': '-', '\\': '-'})
+
+# Pushover (user key, API token), kept once both are found in the environment
+_credentials: Tuple[str, ...] = ()
+
+def _pushover_credentials() -> Tuple[str, ...]:
+    """
+    Get the Pushover credentials from the environment.
+    
+    Returns:
+        A (user key, API token) tuple, or an empty tuple if either is unset.
+    """
+    global _credentials
+    if not _credentials:
+        user_key = os.getenv("PUSHOVER_USER_KEY")
+        api_token = os.getenv("PUSHOVER_API_TOKEN")
+        if user_key and api_token:
+            _credentials = (user_key, api_token)
+    return _credentials
+
 class PagerInput(BaseModel):
     """Input schema for PagerTool."""
     title: str = Field(..., description="Title of the alert")
@@ -46,6 +111,49 @@ class PagerTool(BaseTool[PagerInput, PagerOutput]):
             priority=input_obj.priority
         )
         
+        return self._finish_page(input_obj, pushover_result)
+    
+    async def run_many(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several alerts at once, overlapping their Pushover round trips.
+        
+        Args:
+            inputs: The arguments for each alert, as passed to run.
+            
+        Returns:
+            The output for each alert, in the same order as inputs.
+        """
+        input_objs = [self._parse_input(args) for args in inputs]
+        
+        pushover_results = await asyncio.gather(*(
+            self._send_pushover_async(
+                title=input_obj.title,
+                message=input_obj.body,
+                priority=input_obj.priority
+            )
+            for input_obj in input_objs
+        ))
+        
+        # Fallback scrolls are written to disk, so keep them off the loop
+        loop = asyncio.get_running_loop()
+        outputs = await asyncio.gather(*(
+            loop.run_in_executor(None, self._finish_page, input_obj, pushover_result)
+            for input_obj, pushover_result in zip(input_objs, pushover_results)
+        ))
+        
+        return [output.model_dump() for output in outputs]
+    
+    def _finish_page(self, input_obj: PagerInput, pushover_result: bool) -> PagerOutput:
+        """
+        Report a page, falling back to a ninja scroll if Pushover failed.
+        
+        Args:
+            input_obj: An instance of PagerInput.
+            pushover_result: Whether the alert was sent via Pushover.
+            
+        Returns:
+            An instance of PagerOutput.
+        """
         if pushover_result:
             return PagerOutput(
                 status="success",
@@ -70,6 +178,33 @@ class PagerTool(BaseTool[PagerInput, PagerOutput]):
             method="none"
         )
     
+    def _pushover_data(self, title: str, message: str, priority: int) -> Dict[str, Any]:
+        """
+        Build the form data of a Pushover request.
+        
+        Args:
+            title: The title of the alert.
+            message: The message of the alert.
+            priority: The priority of the alert (0-2).
+            
+        Returns:
+            The form data, or an empty dict if the credentials are not set.
+        """
+        # Check if Pushover credentials are available
+        credentials = _pushover_credentials()
+        if not credentials:
+            return {}
+        user_key, api_token = credentials
+        
+        return {
+            "token": api_token,
+            "user": user_key,
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "sound": "siren" if priority >= 1 else "pushover"
+        }
+    
     def _send_pushover(self, title: str, message: str, priority: int) -> bool:
         """
         Send an alert via Pushover.
@@ -82,27 +217,40 @@ class PagerTool(BaseTool[PagerInput, PagerOutput]):
         Returns:
             True if the alert was sent successfully, False otherwise.
         """
-        # Check if Pushover credentials are available
-        user_key = os.getenv("PUSHOVER_USER_KEY")
-        api_token = os.getenv("PUSHOVER_API_TOKEN")
+        data = self._pushover_data(title, message, priority)
+        if not data:
+            return False
         
-        if not user_key or not api_token:
+        try:
+            # Send the alert over the shared session
+            response = _session.post(PUSHOVER_URL, data=data, timeout=PUSHOVER_TIMEOUT)
+            
+            # Check if the request was successful
+            return response.status_code == 200
+            
+        except Exception:
+            return False
+    
+    async def _send_pushover_async(self, title: str, message: str, priority: int) -> bool:
+        """
+        Send an alert via Pushover without blocking the event loop.
+        
+        Args:
+            title: The title of the alert.
+            message: The message of the alert.
+            priority: The priority of the alert (0-2).
+            
+        Returns:
+            True if the alert was sent successfully, False otherwise.
+        """
+        data = self._pushover_data(title, message, priority)
+        if not data:
             return False
         
         try:
-            # Send the alert
-            response = requests.post(
-                "https://api.pushover.net/1/messages.json",
-                data={
-                    "token": api_token,
-                    "user": user_key,
-                    "title": title,
-                    "message": message,
-                    "priority": priority,
-                    "sound": "siren" if priority >= 1 else "pushover"
-                },
-                timeout=5
-            )
+            # Send the alert over the shared async client
+            client = await _get_async_client()
+            response = await client.post(PUSHOVER_URL, data=data)
             
             # Check if the request was successful
             return response.status_code == 200
@@ -129,15 +277,22 @@ class PagerTool(BaseTool[PagerInput, PagerOutput]):
             os.makedirs(".scrolls", exist_ok=True)
             
             # Create a timestamp for the scroll name
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%m-%d-%H%M")
+            now = datetime.now()
+            timestamp = f"{now.month:02d}-{now.day:02d}-{now.hour:02d}{now.minute:02d}"
             # Sanitize the title for use in a filename
-            safe_title = title.lower().replace(' ', '-').replace(':', '').replace('/', '-').replace('\\', '-')
+            safe_title = title.lower().translate(_TITLE_TABLE)
             scroll_path = f".scrolls/{timestamp}-page-{safe_title}.md"
             
-            # Write the scroll content
-            with open(scroll_path, "w") as f:
-                f.write(f"# {title}\n\n{body}\n\n**Priority: HIGH**\n\n*This is a page alert from Shihan.*")
+            # Write the scroll content without a buffered file, usually in one
+            # write; a short write is continued from where it stopped
+            payload = f"# {title}\n\n{body}\n\n**Priority: HIGH**\n\n*This is a page alert from Shihan.*".encode()
+            fd = os.open(scroll_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             
             print(f"Created scroll: {scroll_path}")
             
@@ -3,13 +3,27 @@ PlanCriticTool - Scores ninja plans on precision, minimalism, and test coverage.
 """
 
 import os
+import re
+import json
+import hashlib
+import tempfile
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
-import openai
 
 from ..config import ChatCfg, Paths
 from .base_tool import BaseTool
 
+# Keywords that pick the mock critique, matched case-insensitively in place
+# rather than in a lowercased copy of the scroll
+MULTIPLE_ISSUES_PATTERN = re.compile(r'multiple issues|several issues', re.IGNORECASE)
+OUT_OF_MEMORY_PATTERN = re.compile(r'cuda out of memory|oom', re.IGNORECASE)
+
+# File critiques are kept in, so they survive restarts
+CRITIQUE_CACHE_PATH = os.path.join(Paths.SCROLLS, ".critique_cache.json")
+
+# Critiques kept; the least recently used are dropped first
+CRITIQUE_CACHE_SIZE = 256
+
 class PlanCriticInput(BaseModel):
     """Input schema for PlanCriticTool."""
     scroll_path: str = Field(..., description="Path to the ninja scroll to critique")
@@ -27,6 +41,14 @@ class PlanCriticTool(BaseTool[PlanCriticInput, PlanCriticOutput]):
     input_schema = PlanCriticInput
     output_schema = PlanCriticOutput
     
+    def __init__(self):
+        """Initialize the tool with the critiques cached by earlier runs."""
+        super().__init__()
+        
+        # Critiques keyed by a digest of the model and the scroll content,
+        # least recently used first
+        self._critique_cache: Dict[str, Dict[str, Any]] = self._load_critique_cache()
+    
     def _run(self, input_obj: PlanCriticInput) -> PlanCriticOutput:
         """
         Critique the ninja plan at the specified path.
@@ -55,14 +77,112 @@ class PlanCriticTool(BaseTool[PlanCriticInput, PlanCriticOutput]):
                 issues=[f"Error reading scroll: {str(e)}"]
             )
         
-        # Invoke LLM to critique the plan
-        critique_result = self._critique_with_llm(scroll_content)
+        # Reuse the critique of an identical scroll, else invoke LLM to
+        # critique the plan
+        key = self._critique_key(scroll_content)
+        critique_result = self._critique_cache.get(key)
+        if not critique_result:
+            # Another tool may have saved it since this one loaded the cache
+            self._merge_critique_cache()
+            critique_result = self._critique_cache.get(key)
+        if not critique_result:
+            critique_result = self._critique_with_llm(scroll_content)
+        self._store_critique(key, critique_result)
         
         return PlanCriticOutput(
             score=critique_result["score"],
             issues=critique_result["issues"]
         )
     
+    def _critique_key(self, scroll_content: str) -> str:
+        """
+        Key the critique of a scroll.
+        
+        The model is part of the key, so changing it invalidates the cache.
+        
+        Args:
+            scroll_content: The content of the ninja scroll.
+            
+        Returns:
+            A hex digest of the model and the scroll content.
+        """
+        digest = hashlib.blake2b(ChatCfg.model.encode(), digest_size=16)
+        digest.update(b"\0")
+        digest.update(scroll_content.encode())
+        return digest.hexdigest()
+    
+    def _load_critique_cache(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the critiques saved by earlier runs.
+        
+        Returns:
+            The cached critiques, or an empty dict if none could be loaded.
+        """
+        try:
+            with open(CRITIQUE_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        return cache if isinstance(cache, dict) else {}
+    
+    def _merge_critique_cache(self):
+        """
+        Merge in the critiques other tools have saved since this one loaded
+        the cache.
+        
+        Critiques found only on disk count as less recently used than those
+        held in memory.
+        """
+        merged = {
+            key: critique
+            for key, critique in self._load_critique_cache().items()
+            if key not in self._critique_cache
+        }
+        merged.update(self._critique_cache)
+        self._critique_cache = merged
+    
+    def _store_critique(self, key: str, critique_result: Dict[str, Any]):
+        """
+        Cache a critique as the most recently used, saving the cache if the
+        critique is new.
+        
+        Args:
+            key: The key of the critique.
+            critique_result: The critique results.
+        """
+        is_new = key not in self._critique_cache
+        if is_new:
+            # Keep what other tools have saved rather than write over it
+            self._merge_critique_cache()
+        
+        # Move the critique to the most recently used end
+        self._critique_cache.pop(key, None)
+        self._critique_cache[key] = critique_result
+        while len(self._critique_cache) > CRITIQUE_CACHE_SIZE:
+            del self._critique_cache[next(iter(self._critique_cache))]
+        
+        if not is_new:
+            return
+        
+        # Write a uniquely named temporary file and swap it in, so a crash
+        # mid-write cannot leave a truncated cache and concurrent writers
+        # cannot share a temporary file
+        tmp_path = ""
+        try:
+            os.makedirs(Paths.SCROLLS, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=Paths.SCROLLS,
+                prefix=".critique_cache.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(self._critique_cache, f)
+            os.replace(tmp_path, CRITIQUE_CACHE_PATH)
+        except OSError as e:
+            print(f"Note: Could not save critique cache: {str(e)}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
     def _critique_with_llm(self, scroll_content: str) -> Dict[str, Any]:
         """
         Use an LLM to critique the ninja plan.
@@ -77,7 +197,7 @@ class PlanCriticTool(BaseTool[PlanCriticInput, PlanCriticOutput]):
         print("Note: Using mock critique instead of calling OpenAI API")
         
         # Check if the scroll contains multiple issues
-        if "multiple issues" in scroll_content.lower() or "several issues" in scroll_content.lower():
+        if MULTIPLE_ISSUES_PATTERN.search(scroll_content):
             return {
                 "score": 45,
                 "issues": [
@@ -102,7 +222,7 @@ class PlanCriticTool(BaseTool[PlanCriticInput, PlanCriticOutput]):
             }
         
         # Check if the scroll contains CUDA out of memory error
-        elif "cuda out of memory" in scroll_content.lower() or "oom" in scroll_content.lower():
+        elif OUT_OF_MEMORY_PATTERN.search(scroll_content):
             return {
                 "score": 85,
                 "issues": [
@@ -22,14 +22,14 @@ def main():
         print(f"Error: {scrolls_dir} directory not found")
         return
     
-    scrolls = [os.path.join(scrolls_dir, f) for f in os.listdir(scrolls_dir) if f.endswith('.md')]
+    with os.scandir(scrolls_dir) as entries:
+        scrolls = [entry for entry in entries if entry.name.endswith('.md')]
     if not scrolls:
         print(f"Error: No scrolls found in {scrolls_dir}")
         return
     
-    # Sort by modification time (newest first)
-    scrolls.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    scroll_path = scrolls[0]
+    # Pick the newest, using the stat each directory entry caches
+    scroll_path = max(scrolls, key=lambda entry: entry.stat().st_mtime).path
     
     print(f"Using scroll: {scroll_path}")
     
@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration for the Shihan MCP tests.
+"""
+
+import importlib.util
+
+# test_shihan.py drives a live server over MCP, so it needs the mcp package
+collect_ignore = [] if importlib.util.find_spec("mcp") else ["test_shihan.py"]
@@ -0,0 +1,67 @@
+"""
+Unit tests for the BaseTool input handling.
+"""
+
+import sys
+from typing import List
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+
+from shihan_mcp.tools.base_tool import BaseTool
+
+class EchoInput(BaseModel):
+    """Input schema for EchoTool."""
+    count: int = Field(..., description="How many times to echo")
+    words: List[str] = Field(default_factory=list, description="Words to echo")
+
+class EchoOutput(BaseModel):
+    """Output schema for EchoTool."""
+    echoed: List[str] = Field(default_factory=list, description="The echoed words")
+
+class EchoTool(BaseTool[EchoInput, EchoOutput]):
+    """Tool that repeats its words, recording the input it was given."""
+    
+    input_schema = EchoInput
+    output_schema = EchoOutput
+    
+    def _run(self, input_obj: EchoInput) -> EchoOutput:
+        """Echo the words count times."""
+        self.last_input = input_obj
+        return EchoOutput(echoed=list(input_obj.words) * input_obj.count)
+
+def test_run_validates_by_default():
+    """Test that arguments are validated and coerced."""
+    tool = EchoTool()
+    assert tool.run({"count": "2", "words": ["a"]}) == {"echoed": ["a", "a"]}
+    
+    with pytest.raises(ValidationError):
+        tool.run({"words": ["a"]})
+
+def test_run_constructs_input_without_validation():
+    """Test that trusted arguments are used as given, with defaults filled in."""
+    tool = EchoTool()
+    tool.validate_input = False
+    
+    assert tool.run({"count": 2}) == {"echoed": []}
+    assert isinstance(tool.last_input, EchoInput)
+    assert tool.last_input.words == []
+    
+    # Nothing is coerced
+    assert tool._parse_input({"count": "2"}).count == "2"
+
+def test_missing_schemas_default_to_empty():
+    """Test that a tool without schemas takes and returns nothing."""
+    class DictTool(BaseTool):
+        """Tool with no schemas that returns a dict."""
+        
+        def _run(self, input_obj):
+            """List the input's fields."""
+            return {"fields": sorted(type(input_obj).model_fields)}
+    
+    tool = DictTool()
+    assert tool.input_schema is tool.output_schema
+    assert tool.run({}) == {"fields": []}
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,51 @@
+"""
+Unit tests for the shared OpenAI clients on ChatCfg.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from shihan_mcp.config import ChatCfg
+
+def test_concurrent_first_calls_build_one_client(monkeypatch):
+    """Test that threads racing the first call, as the prewarm thread does, share one pool."""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("openai")
+    pools = []
+    
+    class SlowClient(httpx.Client):
+        """An httpx.Client that is slow to build, widening any race."""
+        
+        def __init__(self, limits, timeout):
+            """Record the pool, then build it."""
+            pools.append(self)
+            time.sleep(0.05)
+            super().__init__(limits=limits, timeout=timeout)
+    
+    monkeypatch.setattr(httpx, "Client", SlowClient)
+    monkeypatch.setattr(ChatCfg, "api_key", "test-key")
+    monkeypatch.setattr(ChatCfg, "_client", None)
+    monkeypatch.setattr(ChatCfg, "_http_client", None)
+    
+    barrier = threading.Barrier(8)
+    clients = []
+    
+    def first_call():
+        barrier.wait()
+        clients.append(ChatCfg.client())
+    
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(pools) == 1
+    assert all(client is clients[0] for client in clients)
+    pools[0].close()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,190 @@
+"""
+Unit tests for the CreedAuditTool.
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+from shihan_mcp.tools import creed_audit
+from shihan_mcp.tools.creed_audit import CreedAuditTool, PATTERN_DESCRIPTIONS
+
+# The patterns as first written, matched against str lines
+ORIGINAL_PATTERNS = {
+    "is_none": re.compile(r'\bis\s+None\b'),
+    "is_not_none": re.compile(r'\bis\s+not\s+None\b'),
+    "kwargs": re.compile(r'\*\*kwargs'),
+    "mock": re.compile(r'\bmock\b|\bMagicMock\b'),
+    "if_none_fallback": re.compile(r'if\s+.*?is\s+None'),
+    "hasattr": re.compile(r'\bhasattr\b'),
+    "silent_exception": re.compile(r'except.*?:(\s*)pass'),
+    "unused_tensor": re.compile(r'torch\.tensor\(.*?\).*?(?!\S)'),
+    "fallback_pattern": re.compile(r'if\s+.*?:\s*.*?\s*else\s*.*?return\s+0'),
+}
+
+def original_violations(file_path):
+    """
+    Audit a file the way the tool first did: a text-mode read, then every
+    pattern over every line.
+    
+    Args:
+        file_path: The path of the file to check.
+    
+    Returns:
+        A list of violation messages.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return [f"Error reading {file_path}: {str(e)}"]
+    
+    violations = []
+    lines = content.split('\n')
+    for pattern_name, pattern in ORIGINAL_PATTERNS.items():
+        for i, line in enumerate(lines):
+            if pattern.search(line) and not line.strip().startswith('#'):
+                if len(line) > 50:
+                    line = line[:47] + "..."
+                violations.append(f"{file_path}:{i+1}: {PATTERN_DESCRIPTIONS[pattern_name]}\n  {line.strip()}")
+    return violations
+
+SOURCE = [
+    "import torch",
+    "def check(x, y):",
+    "    if x is None:",
+    "        return 0",
+    "    # if y is None: a comment",
+    "    mock = hasattr(x, 'shape')",
+    "    try:",
+    "        t = torch.tensor([1, 2])",
+    "    except ValueError: pass",
+    "    return y is not None",
+]
+
+# Fixtures whose bytes the mmap scanner cannot check as is
+FIXTURES = {
+    "lf.py": "\n".join(SOURCE).encode(),
+    "crlf.py": "\r\n".join(SOURCE).encode(),
+    "cr.py": "\r".join(SOURCE).encode(),
+    "mixed.py": ("\r\n".join(SOURCE[:5]) + "\r" + "\n".join(SOURCE[5:])).encode(),
+    # Unicode whitespace: \s matches it, and strip() removes it before a comment
+    "unicode_space.py": "if x is\u00a0None:\n\u2003# y is None\nz = 'caf\u00e9' is None\n".encode(),
+    # Unicode word characters: \b does not fall between them and an anchor
+    "unicode_word.py": "\u00e9is None\nx\u00e9mock = 1\nmock\u00e9 = 2\nmock = 3\n".encode(),
+    # ASCII controls that str, unlike bytes, counts as whitespace
+    "controls.py": "if x is\x1cNone:\n\x1f# y is None\n".encode(),
+    "bom.py": "\ufeffif x is None:\n".encode(),
+    "latin1.py": "caf\u00e9 = x is None\n".encode("latin-1"),
+}
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_matches_original_audit(tmp_path, name):
+    """Test that line endings and non-ASCII text are audited as a text-mode read would."""
+    path = tmp_path / name
+    path.write_bytes(FIXTURES[name])
+    
+    violations = CreedAuditTool().run({"files": [str(path)]})["violations"]
+    assert violations == original_violations(str(path))
+
+def test_bare_cr_line_numbers(tmp_path):
+    """Test that a bare CR ends a line."""
+    path = tmp_path / "cr.py"
+    path.write_bytes(FIXTURES["cr.py"])
+    
+    violations = CreedAuditTool().run({"files": [str(path)]})["violations"]
+    assert violations[0].startswith(f"{path}:3: Using 'is None' check")
+
+def test_process_pool_matches_in_process_scan(tmp_path, monkeypatch):
+    """Test that the worker pool returns the in-process results, in order."""
+    paths = []
+    for name, data in sorted(FIXTURES.items()):
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    expected = list(map(creed_audit._scan_file, paths))
+    
+    monkeypatch.setattr(creed_audit, "PROCESS_POOL_MIN_FILES", 2)
+    monkeypatch.setattr(creed_audit.os, "cpu_count", lambda: 2)
+    assert creed_audit._scan_files(paths) == expected
+
+def test_scanner_line_numbers_and_comments(tmp_path):
+    """Test line numbers across far-apart candidates, and skipped comments."""
+    lines = ["x = 1"] * 500
+    lines[0] = "if a is None: pass"
+    lines[10] = "    # hasattr(a, 'b') in a comment"
+    lines[250] = "f(**kwargs)"
+    lines[499] = "ok = hasattr(a, 'b')"
+    path = tmp_path / "far.py"
+    path.write_text("\n".join(lines))
+    
+    violations = CreedAuditTool().run({"files": [str(path)]})["violations"]
+    assert violations == original_violations(str(path))
+    # Grouped by pattern: is_none, kwargs, if_none_fallback, hasattr
+    assert [v.split(": ")[0] for v in violations] == [
+        f"{path}:1", f"{path}:251", f"{path}:1", f"{path}:500"
+    ]
+
+def test_scanner_empty_and_missing_files(tmp_path):
+    """Test that empty files pass and missing or non-Python files are handled."""
+    empty = tmp_path / "empty.py"
+    empty.write_bytes(b"")
+    notes = tmp_path / "notes.txt"
+    notes.write_text("x is None\n")
+    missing = tmp_path / "missing.py"
+    
+    violations = CreedAuditTool().run({"files": [str(empty), str(notes), str(missing)]})["violations"]
+    assert violations == [f"File not found: {missing}"]
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Record the paths handed to the scanner."""
+    paths = []
+    scan_files = creed_audit._scan_files
+    
+    def record(file_paths):
+        paths.extend(file_paths)
+        return scan_files(file_paths)
+    
+    monkeypatch.setattr(creed_audit, "_scan_files", record)
+    return paths
+
+def test_cache_reuses_unchanged_files(tmp_path, scanned):
+    """Test that a file is rescanned only when its mtime or size changes."""
+    path = tmp_path / "cached.py"
+    path.write_text("if x is None:\n")
+    tool = CreedAuditTool()
+    
+    first = tool.run({"files": [str(path)]})["violations"]
+    assert tool.run({"files": [str(path)]})["violations"] == first
+    assert scanned == [str(path)]
+    
+    # Same size, new mtime
+    path.write_text("if y is None:\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert tool.run({"files": [str(path)]})["violations"] == original_violations(str(path))
+    assert scanned == [str(path)] * 2
+    
+    # Same mtime, new size
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text("ok = 1\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert tool.run({"files": [str(path)]})["violations"] == []
+    assert scanned == [str(path)] * 3
+
+def test_cache_skips_unreadable_files(tmp_path, scanned):
+    """Test that a file that could not be read is scanned again next time."""
+    path = tmp_path / "latin1.py"
+    path.write_bytes(FIXTURES["latin1.py"])
+    tool = CreedAuditTool()
+    
+    first = tool.run({"files": [str(path)]})["violations"]
+    assert first[0].startswith(f"Error reading {path}: ")
+    assert tool.run({"files": [str(path)]})["violations"] == first
+    assert scanned == [str(path)] * 2
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
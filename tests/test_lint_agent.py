@@ -0,0 +1,217 @@
+"""
+Unit tests for the LintAgent, run against a stubbed OpenAI client.
+"""
+
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from shihan_mcp.agents.lint_agent import LintAgent, LintInput, _ArrayItemScanner
+from shihan_mcp.config import ChatCfg
+
+ISSUES = [
+    {"line": 3, "column": None, "message": "Reshape without checking dimensions", "severity": "warning"},
+    {"line": 7, "column": 4, "message": "Unused tensor", "severity": "info"},
+]
+
+# The LLM's answer, wrapped in an object
+RESPONSE = json.dumps({"issues": ISSUES})
+
+CODE = "import torch\nx = torch.ones(3)\n"
+
+def chunks(text, size=7):
+    """
+    Split a response into streamed chat completion chunks.
+    
+    Args:
+        text: The full response.
+        size: Characters per chunk.
+    
+    Returns:
+        The chunks, with an empty-choices chunk first as the API may send.
+    """
+    pieces = [SimpleNamespace(choices=[])]
+    for i in range(0, len(text), size):
+        delta = SimpleNamespace(content=text[i:i+size])
+        pieces.append(SimpleNamespace(choices=[SimpleNamespace(delta=delta)]))
+    return pieces
+
+class StubCompletions:
+    """Stands in for client.chat.completions, recording each request."""
+    
+    def __init__(self, response, error=None):
+        """Initialize with the response to stream, or an error to raise."""
+        self.response = response
+        self.error = error
+        self.requests = []
+    
+    def create(self, **request):
+        """Stream the response synchronously."""
+        self.requests.append(request)
+        if self.error:
+            raise self.error
+        return iter(chunks(self.response))
+
+class StubAsyncCompletions(StubCompletions):
+    """Stands in for the async client's chat.completions."""
+    
+    async def create(self, **request):
+        """Stream the response asynchronously."""
+        pieces = StubCompletions.create(self, **request)
+        
+        async def stream():
+            for piece in pieces:
+                await asyncio.sleep(0)
+                yield piece
+        
+        return stream()
+
+@pytest.fixture
+def stub_clients(monkeypatch):
+    """Install stubbed sync and async clients on ChatCfg."""
+    completions = StubCompletions(RESPONSE)
+    async_completions = StubAsyncCompletions(RESPONSE)
+    monkeypatch.setattr(ChatCfg, "api_key", "test-key")
+    monkeypatch.setattr(ChatCfg, "lint_enabled", True)
+    monkeypatch.setattr(ChatCfg, "_client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setattr(ChatCfg, "_async_client", SimpleNamespace(chat=SimpleNamespace(completions=async_completions)))
+    return completions, async_completions
+
+def issue_dicts(issues):
+    """Convert LintIssue objects to dictionaries for comparison."""
+    return [issue.model_dump() for issue in issues]
+
+def test_array_item_scanner_across_chunks():
+    """Test that items are reported once complete, whatever the chunking."""
+    for size in (1, 3, 7, len(RESPONSE)):
+        scanner = _ArrayItemScanner()
+        items = []
+        for i in range(0, len(RESPONSE), size):
+            items.extend(scanner.feed(RESPONSE[i:i+size]))
+        assert [json.loads(item) for item in items] == ISSUES
+
+def test_array_item_scanner_ignores_braces_in_strings():
+    """Test that brackets and escaped quotes inside strings are not structure."""
+    scanner = _ArrayItemScanner()
+    text = json.dumps([{"message": "x[0] } \" {", "line": 1}])
+    assert [json.loads(item) for item in scanner.feed(text)] == [{"message": "x[0] } \" {", "line": 1}]
+
+def test_array_item_scanner_only_reports_array_items():
+    """Test that objects outside arrays are not reported."""
+    scanner = _ArrayItemScanner()
+    assert scanner.feed(json.dumps({"a": {"b": 1}})) == []
+
+def test_run_is_synchronous(stub_clients):
+    """Test that run lints through the sync client and returns its issues."""
+    completions, async_completions = stub_clients
+    output = LintAgent().run(LintInput(file_path="train.py", code=CODE))
+    
+    assert issue_dicts(output.issues) == ISSUES
+    assert output.summary == "Found 2 lint issues in train.py"
+    assert completions.requests[0]["stream"]
+    assert CODE in completions.requests[0]["messages"][1]["content"]
+    assert not async_completions.requests
+
+def test_run_reports_client_errors(stub_clients):
+    """Test that a failed request is reported as an error issue."""
+    completions, _ = stub_clients
+    completions.error = RuntimeError("connection refused")
+    output = LintAgent().run(LintInput(file_path="train.py", code=CODE))
+    
+    assert [issue.message for issue in output.issues] == ["Error linting code: connection refused"]
+
+@pytest.mark.parametrize("response, parsed", [
+    (json.dumps({"issues": ISSUES + [{"note": "not an issue"}]}), ISSUES),
+    (json.dumps(ISSUES[0]), []),
+    (json.dumps({"error": "cannot lint this"}), []),
+    (RESPONSE[:-10], ISSUES[:1]),
+    ("", []),
+])
+def test_run_reports_responses_that_are_not_issues(stub_clients, response, parsed):
+    """Test that items that are not issues, no list of issues, or a cut-off response end with an error issue."""
+    completions, _ = stub_clients
+    completions.response = response
+    issues = LintAgent().run(LintInput(file_path="train.py", code=CODE)).issues
+    
+    assert issue_dicts(issues[:-1]) == parsed
+    assert issues[-1].severity == "error"
+    assert issues[-1].message.startswith("Error linting code: ")
+
+@pytest.mark.parametrize("response", ["[]", json.dumps({"issues": []})])
+def test_run_accepts_an_empty_list(stub_clients, response):
+    """Test that a response listing no issues is not an error."""
+    completions, _ = stub_clients
+    completions.response = response
+    output = LintAgent().run(LintInput(file_path="train.py", code=CODE))
+    
+    assert output.issues == []
+    assert output.summary == "Found 0 lint issues in train.py"
+
+def test_run_skips_without_calling_the_llm(stub_clients, tmp_path):
+    """Test the skip summaries, none of which call the LLM."""
+    completions, _ = stub_clients
+    agent = LintAgent()
+    plain = tmp_path / "plain.py"
+    plain.write_text("print('hello')\n")
+    
+    assert agent.run(LintInput(file_path="notes.txt", code=CODE)).summary == "Not a Python file, skipping lint"
+    assert agent.run(LintInput(file_path=str(plain))).summary == "No tensor operations found, skipping lint"
+    assert agent.run(LintInput(file_path="train.py", code="x = 1\n")).summary == "No tensor operations found, skipping lint"
+    assert not completions.requests
+
+def test_run_without_api_key(stub_clients, monkeypatch):
+    """Test that nothing is sent without an API key."""
+    completions, _ = stub_clients
+    monkeypatch.setattr(ChatCfg, "api_key", None)
+    output = LintAgent().run(LintInput(file_path="train.py", code=CODE))
+    
+    assert output.issues == []
+    assert output.summary == "No OpenAI API key configured, skipping lint"
+    assert not completions.requests
+
+def test_run_is_a_placeholder_unless_enabled(stub_clients, monkeypatch):
+    """Test that an API key alone does not send code to the LLM."""
+    completions, async_completions = stub_clients
+    monkeypatch.setattr(ChatCfg, "lint_enabled", False)
+    agent = LintAgent()
+    
+    output = agent.run(LintInput(file_path="train.py", code=CODE))
+    assert output.issues == []
+    assert output.summary.startswith("LintAgent is a placeholder for a future extension.")
+    assert asyncio.run(agent.run_async(LintInput(file_path="train.py", code=CODE))) == output
+    assert not completions.requests
+    assert not async_completions.requests
+
+def test_run_async_and_run_many(stub_clients):
+    """Test that the async entry points use the async client."""
+    completions, async_completions = stub_clients
+    agent = LintAgent()
+    
+    output = asyncio.run(agent.run_async(LintInput(file_path="train.py", code=CODE)))
+    assert issue_dicts(output.issues) == ISSUES
+    
+    outputs = asyncio.run(agent.run_many([
+        LintInput(file_path="a.py", code=CODE),
+        LintInput(file_path="b.txt", code=CODE),
+        LintInput(file_path="c.py", code=CODE),
+    ]))
+    assert [output.summary for output in outputs] == [
+        "Found 2 lint issues in a.py",
+        "Not a Python file, skipping lint",
+        "Found 2 lint issues in c.py",
+    ]
+    assert len(async_completions.requests) == 3
+    assert not completions.requests
+
+def test_stream_issues(stub_clients):
+    """Test that stream_issues yields each issue in order."""
+    async def collect():
+        return [issue async for issue in LintAgent().stream_issues(LintInput(file_path="train.py", code=CODE))]
+    
+    assert issue_dicts(asyncio.run(collect())) == ISSUES
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
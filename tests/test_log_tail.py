@@ -0,0 +1,132 @@
+"""
+Unit tests for the LogSentinelTool.
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+from shihan_mcp.config import Paths
+from shihan_mcp.tools import log_tail
+from shihan_mcp.tools.log_tail import LogSentinelTool
+
+LOGS = {
+    "empty": "",
+    "newline": "\n",
+    "one_line": "only line",
+    "trailing_newline": "".join(f"line {i}\n" for i in range(40)),
+    "no_trailing_newline": "\n".join(f"line {i}" for i in range(40)),
+    "blank_lines": "a\n\n\nb\n\n",
+    "crlf": "".join(f"line {i}\r\n" for i in range(40)),
+    "long_lines": "\n".join(c * 300 for c in "abcdefgh") + "\n",
+    "non_ascii": "".join(f"café {i} érror\n" for i in range(40)),
+}
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    """Point the tool at a log in a temporary directory, read in tiny blocks."""
+    path = tmp_path / "training.log"
+    monkeypatch.setattr(Paths, "LOG", str(path))
+    monkeypatch.setattr(log_tail, "TAIL_BLOCK_SIZE", 7)
+    return path
+
+@pytest.mark.skipif(not shutil.which("tail"), reason="tail is not installed")
+@pytest.mark.parametrize("name", sorted(LOGS))
+@pytest.mark.parametrize("tail_lines", [0, 1, 2, 5, 39, 40, 41, 500])
+def test_tail_log_matches_tail(log, name, tail_lines):
+    """Test that reading blocks backwards returns what `tail -n` does."""
+    log.write_bytes(LOGS[name].encode())
+    expected = subprocess.run(
+        ["tail", "-n", str(tail_lines), str(log)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert LogSentinelTool()._tail_log(tail_lines) == expected
+
+def test_tail_log_missing_file(log):
+    """Test the message for a missing log."""
+    assert LogSentinelTool()._tail_log(10) == f"Error: Log file {log} not found"
+
+def original_runtime(log_content):
+    """
+    Compute the runtime the way the tool first did, from every timestamp.
+    
+    Args:
+        log_content: The log content to search.
+    
+    Returns:
+        The formatted runtime.
+    """
+    timestamps = re.findall(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', log_content)
+    if len(timestamps) < 2:
+        return "Unknown (insufficient timestamps)"
+    try:
+        first_time = datetime.strptime(timestamps[0], '%Y-%m-%d %H:%M:%S')
+        last_time = datetime.strptime(timestamps[-1], '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return "Unknown (invalid timestamps)"
+    
+    delta = last_time - first_time
+    hours, remainder = divmod(delta.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if delta.days > 0:
+        return f"{delta.days}d {hours}h {minutes}m {seconds}s"
+    elif hours > 0:
+        return f"{hours}h {minutes}m {seconds}s"
+    elif minutes > 0:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+def stamped(hour, text="step"):
+    """Make a log line stamped at the given hour."""
+    return f"2024-01-01 {hour:02d}:00:00 {text}"
+
+RUNTIME_LOGS = {
+    "no_timestamps": "a\nb\n",
+    "one_timestamp": stamped(0) + "\n",
+    "two_on_one_line": stamped(0) + " " + stamped(2) + "\n",
+    # The last timestamp is within the final 16 lines
+    "recent": "\n".join([stamped(0)] + [stamped(1)] * 5 + ["no time"] * 10 + [""]),
+    # The last timestamp is further back, so the tail check falls through
+    "far_back": "\n".join([stamped(0), stamped(3)] + ["no time"] * 40),
+    # The only timestamps are on the first line and the final line
+    "first_line_then_last": "\n".join([stamped(0) + " " + stamped(1)] + ["no time"] * 40 + [stamped(5)]),
+    "several_on_last_line": "\n".join([stamped(0)] + ["x"] * 20 + [stamped(2) + " " + stamped(4)]),
+    "invalid": "2024-13-45 99:99:99 a\n" + stamped(1),
+    "days": "2024-01-01 00:00:00 a\n2024-01-03 01:02:03 b",
+    "crlf": "\r\n".join([stamped(0), stamped(6), "tail"]),
+}
+
+@pytest.mark.parametrize("name", sorted(RUNTIME_LOGS))
+def test_compute_runtime_matches_full_scan(name):
+    """Test that checking the final lines first finds the same last timestamp."""
+    log_content = RUNTIME_LOGS[name]
+    assert LogSentinelTool()._compute_runtime(log_content) == original_runtime(log_content)
+
+def test_compute_runtime_from_given_start():
+    """Test that a given start is used as the first timestamp."""
+    tool = LogSentinelTool()
+    assert tool._compute_runtime(stamped(3), "2024-01-01 00:00:00") == "3h 0m 0s"
+    assert tool._compute_runtime("no time", "2024-01-01 00:00:00") == "Unknown (insufficient timestamps)"
+    assert tool._compute_runtime(stamped(3), "garbage") == "Unknown (invalid timestamps)"
+
+def test_analyze_given_content():
+    """Test that content read by the caller is analyzed instead of the log file."""
+    result = LogSentinelTool().analyze(
+        stamped(0) + "\n" + stamped(1) + "\nError: disk full\n",
+        "2023-12-31 23:00:00"
+    )
+    
+    assert result.last_error == "Error: disk full\n"
+    assert result.elapsed == "2h 0m 0s"
+
+def test_input_schema_only_takes_tail_lines():
+    """Test that MCP clients can only choose how much of the log is tailed."""
+    assert list(LogSentinelTool.input_schema.model_fields) == ["tail_lines"]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+"""
+Unit tests for the PagerTool.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from shihan_mcp.tools import pager
+from shihan_mcp.tools.pager import PagerTool
+
+@pytest.fixture
+def no_pushover(tmp_path, monkeypatch):
+    """Page without Pushover credentials, writing scrolls under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PUSHOVER_USER_KEY", raising=False)
+    monkeypatch.delenv("PUSHOVER_API_TOKEN", raising=False)
+    monkeypatch.setattr(pager, "_credentials", ())
+    return tmp_path
+
+def test_run_many_falls_back_to_scrolls(no_pushover):
+    """Test that failed pages are written as scrolls, in input order."""
+    outputs = asyncio.run(PagerTool().run_many([
+        {"title": "First alert", "body": "one"},
+        {"title": "Second alert", "body": "two", "priority": 1},
+    ]))
+    
+    assert outputs == [{"status": "success", "method": "ninjascroll"}] * 2
+    scrolls = sorted(path.name for path in (no_pushover / ".scrolls").iterdir())
+    assert [name.split("-page-")[1] for name in scrolls] == ["first-alert.md", "second-alert.md"]
+
+def test_scroll_is_written_whole_after_short_writes(no_pushover, monkeypatch):
+    """Test that a short write is continued rather than truncating the scroll."""
+    write = pager.os.write
+    monkeypatch.setattr(pager.os, "write", lambda fd, data: write(fd, data[:5]))
+    
+    assert PagerTool()._create_ninjascroll("Short writes", "body")
+    (scroll,) = (no_pushover / ".scrolls").iterdir()
+    assert scroll.read_text() == "# Short writes\n\nbody\n\n**Priority: HIGH**\n\n*This is a page alert from Shihan.*"
+
+class StubClient:
+    """Stands in for an httpx.AsyncClient, recording whether it was closed."""
+    
+    def __init__(self):
+        """Initialize an open client."""
+        self.closed = False
+    
+    async def aclose(self):
+        """Close the client."""
+        self.closed = True
+
+def test_async_client_from_another_loop_is_closed(monkeypatch):
+    """Test that the client of a previous event loop is closed, not leaked."""
+    pytest.importorskip("httpx")
+    old_client = StubClient()
+    old_loop = asyncio.new_event_loop()
+    old_loop.close()
+    monkeypatch.setattr(pager, "_async_client", old_client)
+    monkeypatch.setattr(pager, "_async_client_loop", old_loop)
+    
+    async def get_twice():
+        first = await pager._get_async_client()
+        second = await pager._get_async_client()
+        await first.aclose()
+        return first, second
+    
+    first, second = asyncio.run(get_twice())
+    assert old_client.closed
+    assert first is second
+    assert first is not old_client
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,127 @@
+"""
+Unit tests for the PlanCriticTool critique cache.
+"""
+
+import json
+import sys
+
+import pytest
+
+from shihan_mcp.config import ChatCfg, Paths
+from shihan_mcp.tools import plan_critic
+from shihan_mcp.tools.plan_critic import PlanCriticTool
+
+@pytest.fixture
+def scrolls(tmp_path, monkeypatch):
+    """Keep scrolls and the critique cache in a temporary directory."""
+    scrolls_dir = tmp_path / ".scrolls"
+    monkeypatch.setattr(Paths, "SCROLLS", str(scrolls_dir))
+    monkeypatch.setattr(plan_critic, "CRITIQUE_CACHE_PATH", str(scrolls_dir / ".critique_cache.json"))
+    return tmp_path
+
+class CountingCritic(PlanCriticTool):
+    """PlanCriticTool that counts its LLM critiques."""
+    
+    def __init__(self):
+        """Initialize the tool with no critiques made."""
+        self.critiques = 0
+        super().__init__()
+    
+    def _critique_with_llm(self, scroll_content):
+        """Count the critique before making it."""
+        self.critiques += 1
+        return super()._critique_with_llm(scroll_content)
+
+def write_scroll(directory, name, text):
+    """Write a scroll and return its path."""
+    path = directory / name
+    path.write_text(text)
+    return str(path)
+
+def test_cache_survives_restarts(scrolls):
+    """Test that a new tool reuses critiques saved by an earlier one."""
+    scroll = write_scroll(scrolls, "plan.md", "Fix CUDA out of memory with gradient accumulation")
+    
+    first_tool = CountingCritic()
+    first = first_tool.run({"scroll_path": scroll})
+    assert first_tool.run({"scroll_path": scroll}) == first
+    assert first_tool.critiques == 1
+    
+    second_tool = CountingCritic()
+    assert second_tool.run({"scroll_path": scroll}) == first
+    assert second_tool.critiques == 0
+
+def test_tools_sharing_the_cache_keep_each_others_critiques(scrolls):
+    """Test that two live tools merge the saved cache instead of overwriting it."""
+    first_scroll = write_scroll(scrolls, "p1.md", "first plan")
+    second_scroll = write_scroll(scrolls, "p2.md", "second plan")
+    first_tool = CountingCritic()
+    second_tool = CountingCritic()
+    
+    first_tool.run({"scroll_path": first_scroll})
+    second_tool.run({"scroll_path": second_scroll})
+    with open(plan_critic.CRITIQUE_CACHE_PATH) as f:
+        assert len(json.load(f)) == 2
+    
+    # Each live tool picks up the other's critique without critiquing again
+    first_tool.run({"scroll_path": second_scroll})
+    second_tool.run({"scroll_path": first_scroll})
+    assert first_tool.critiques == second_tool.critiques == 1
+    
+    fresh_tool = CountingCritic()
+    fresh_tool.run({"scroll_path": first_scroll})
+    fresh_tool.run({"scroll_path": second_scroll})
+    assert fresh_tool.critiques == 0
+    assert sorted(path.name for path in (scrolls / ".scrolls").iterdir()) == [".critique_cache.json"]
+
+def test_cache_is_keyed_on_content_and_model(scrolls, monkeypatch):
+    """Test that editing the scroll or changing the model critiques again."""
+    scroll = write_scroll(scrolls, "plan.md", "Fix several issues at once")
+    tool = CountingCritic()
+    tool.run({"scroll_path": scroll})
+    
+    write_scroll(scrolls, "plan.md", "Fix several issues at once, carefully")
+    tool.run({"scroll_path": scroll})
+    assert tool.critiques == 2
+    
+    monkeypatch.setattr(ChatCfg, "model", "another-model")
+    tool.run({"scroll_path": scroll})
+    assert tool.critiques == 3
+
+def test_cache_drops_least_recently_used(scrolls, monkeypatch):
+    """Test that the cache keeps only the most recently used critiques."""
+    monkeypatch.setattr(plan_critic, "CRITIQUE_CACHE_SIZE", 2)
+    paths = [write_scroll(scrolls, f"plan{i}.md", f"plan {i}") for i in range(3)]
+    tool = CountingCritic()
+    
+    tool.run({"scroll_path": paths[0]})
+    tool.run({"scroll_path": paths[1]})
+    tool.run({"scroll_path": paths[0]})
+    tool.run({"scroll_path": paths[2]})
+    assert tool.critiques == 3
+    
+    # plan1 was least recently used, so it was dropped; plan0 survives
+    reloaded = CountingCritic()
+    reloaded.run({"scroll_path": paths[0]})
+    assert reloaded.critiques == 0
+    reloaded.run({"scroll_path": paths[1]})
+    assert reloaded.critiques == 1
+    
+    with open(plan_critic.CRITIQUE_CACHE_PATH) as f:
+        assert len(json.load(f)) == 2
+
+def test_unreadable_cache_is_ignored(scrolls):
+    """Test that a corrupt cache file starts an empty cache."""
+    (scrolls / ".scrolls").mkdir()
+    with open(plan_critic.CRITIQUE_CACHE_PATH, "w") as f:
+        f.write("{not json")
+    scroll = write_scroll(scrolls, "plan.md", "plan")
+    
+    tool = CountingCritic()
+    tool.run({"scroll_path": scroll})
+    assert tool.critiques == 1
+    with open(plan_critic.CRITIQUE_CACHE_PATH) as f:
+        assert len(json.load(f)) == 1
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
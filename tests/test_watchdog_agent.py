@@ -0,0 +1,183 @@
+"""
+Unit tests for the WatchdogAgent helpers.
+"""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from shihan_mcp.agents import watchdog_agent
+from shihan_mcp.agents.watchdog_agent import WatchInput, WatchdogAgent
+from shihan_mcp.config import Paths
+from shihan_mcp.tools import pager
+
+def git(*args):
+    """
+    Run a git command in the current directory.
+    
+    Args:
+        args: The arguments to pass to git.
+    
+    Returns:
+        The command's standard output.
+    """
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """
+    Create a repository with a commit, then stage, modify, and remove files.
+    
+    The working directory is changed to the repository for the test.
+    """
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    git("config", "user.email", "shihan@example.com")
+    git("config", "user.name", "Shihan")
+    (tmp_path / "modified.py").write_text("x = 1\n")
+    (tmp_path / "unstaged.py").write_text("y = 1\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "initial")
+    
+    # A new file that is only staged
+    (tmp_path / "staged_new.py").write_text("z = 1\n")
+    git("add", "staged_new.py")
+    
+    # A tracked file modified in the working directory
+    (tmp_path / "modified.py").write_text("x = 2\n")
+    
+    # A tracked file removed from the index but left on disk
+    git("rm", "-q", "--cached", "unstaged.py")
+    
+    # Untracked, and a non-Python file, neither of which is reported
+    (tmp_path / "untracked.py").write_text("u = 1\n")
+    (tmp_path / "notes.txt").write_text("changed\n")
+    return tmp_path
+
+def expected_changed_files():
+    """Get the changed Python files as reported by git itself."""
+    return sorted(
+        path for path in git("diff", "--name-only", "HEAD").split()
+        if path.endswith(watchdog_agent.PYTHON_EXTENSIONS)
+    )
+
+def test_changed_files_with_git(repo):
+    """Test the git subprocess path against git's own output."""
+    agent = WatchdogAgent()
+    agent._repo = None
+    
+    assert sorted(agent._get_changed_files()) == expected_changed_files()
+
+@pytest.mark.skipif(not watchdog_agent.pygit2, reason="pygit2 is not installed")
+def test_changed_files_with_libgit2_includes_staged_new_file(repo):
+    """Test that the libgit2 path matches git, including staged new files."""
+    agent = WatchdogAgent()
+    assert agent._repo
+    
+    changed = sorted(agent._get_changed_files())
+    assert "staged_new.py" in changed
+    assert changed == expected_changed_files()
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    """Point the watchdog at an empty log in a temporary directory."""
+    path = tmp_path / "training.log"
+    path.write_bytes(b"")
+    monkeypatch.setattr(Paths, "LOG", str(path))
+    return path
+
+def append(path, text):
+    """Append text to the log."""
+    with open(path, "a") as f:
+        f.write(text)
+
+def test_read_new_log_follows_appended_lines(log):
+    """Test that each read returns only the complete lines appended since the last."""
+    agent = WatchdogAgent()
+    append(log, "2024-01-01 00:00:00 step 1\nstep 2\n\n")
+    assert agent._read_new_log(500) == "2024-01-01 00:00:00 step 1\nstep 2\n\n"
+    
+    # Nothing new
+    assert agent._read_new_log(500) == ""
+    
+    # A partly written line waits for its newline
+    append(log, "step 3")
+    assert agent._read_new_log(500) == ""
+    append(log, " done\n")
+    assert agent._read_new_log(500) == "step 3 done\n"
+
+def test_read_new_log_keeps_only_the_last_lines(log):
+    """Test that a large append is capped to the last tail_lines lines."""
+    agent = WatchdogAgent()
+    append(log, "".join(f"line {i}\n" for i in range(10000)))
+    
+    assert agent._read_new_log(3) == "line 9997\nline 9998\nline 9999\n"
+
+def test_read_new_log_rereads_an_unfinished_block(log):
+    """Test that an error written across two cycles is read whole."""
+    agent = WatchdogAgent()
+    append(log, "step 1\n\nTraceback (most recent call last):\n  File \"train.py\"\n")
+    agent._read_new_log(500)
+    
+    append(log, "RuntimeError: CUDA out of memory\n\n")
+    new_log = agent._read_new_log(500)
+    assert new_log == (
+        "Traceback (most recent call last):\n  File \"train.py\"\n"
+        "RuntimeError: CUDA out of memory\n\n"
+    )
+    
+    # The block ended with a blank line, so it is not read again
+    append(log, "step 2\n")
+    assert agent._read_new_log(500) == "step 2\n"
+
+def test_read_new_log_restarts_after_truncation(log):
+    """Test that a truncated log is read again from its start."""
+    agent = WatchdogAgent()
+    append(log, "old line 1\nold line 2\n")
+    agent._read_new_log(500)
+    
+    log.write_text("new line\n")
+    assert agent._read_new_log(500) == "new line\n"
+
+def test_check_log_measures_runtime_from_first_timestamp(log):
+    """Test that the runtime covers the whole run, not just the new lines."""
+    agent = WatchdogAgent()
+    append(log, "2024-01-01 00:00:00 start\n2024-01-01 00:01:00 step\n")
+    assert agent._check_log()["elapsed"] == "1m 0s"
+    
+    append(log, "2024-01-01 01:00:00 step\n")
+    assert agent._check_log()["elapsed"] == "1h 0m 0s"
+
+def test_check_log_reuses_result_when_nothing_is_appended(log):
+    """Test that an idle log keeps the previous result."""
+    agent = WatchdogAgent()
+    append(log, "2024-01-01 00:00:00 start\nError: disk full\n")
+    first = agent._check_log()
+    
+    assert agent._check_log() is first
+    assert first["last_error"] == "Error: disk full\n"
+
+def test_manual_check_does_not_critique_its_own_page(log, tmp_path, monkeypatch):
+    """Test that both entry points pick the latest scroll before the log check pages."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Paths, "SCROLLS", str(tmp_path / ".scrolls"))
+    monkeypatch.delenv("PUSHOVER_USER_KEY", raising=False)
+    monkeypatch.delenv("PUSHOVER_API_TOKEN", raising=False)
+    monkeypatch.setattr(pager, "_credentials", ())
+    append(log, "2024-01-01 00:00:00 start\nError: disk full\n")
+    event = WatchInput(event="manual_check")
+    
+    # With no pushover credentials, the page is written as a scroll
+    output = WatchdogAgent().run(event)
+    assert output.paged
+    assert output.actions_taken[-1] == "No recent scrolls found"
+    
+    for path in (tmp_path / ".scrolls").iterdir():
+        path.unlink()
+    assert asyncio.run(WatchdogAgent().run_async(event)) == output
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))